@@ -46,13 +46,13 @@ class AgentManager:
                 return OllamaProvider(model_name=model,
                                       opts=opts)
             case 'gemini':
-                from .providers.gemini import GeminiProvider
+                from .providers.gemini import get_provider
                 api_key = opts.get("llm_api_key", settings.LLM_API_KEY)
                 base_url = opts.get("llm_base_url", settings.LLM_BASE_URL)
-                return GeminiProvider(model_name=self.model,
-                          api_key=api_key,
-                          api_base_url=base_url,
-                          opts=opts)
+                return get_provider(model_name=self.model,
+                                    api_key=api_key,
+                                    api_base_url=base_url,
+                                    opts=opts)
             case _:
                 from .providers.llama_index import LlamaIndexProvider
                 llm_api_key = opts.get("llm_api_key", settings.LLM_API_KEY)
@@ -91,12 +91,12 @@ class EmbeddingManager:
                 model = kwargs.get("embedding_model", self._model)
                 return OllamaEmbeddingProvider(embedding_model=model)
             case 'gemini':
-                from .providers.gemini import GeminiEmbeddingProvider
+                from .providers.gemini import get_embedding_provider
                 api_key = kwargs.get("embedding_api_key", settings.EMBEDDING_API_KEY)
                 base_url = kwargs.get("embedding_base_url", settings.EMBEDDING_BASE_URL)
-                return GeminiEmbeddingProvider(embedding_model=self._model,
-                                   api_key=api_key,
-                                   api_base_url=base_url)
+                return get_embedding_provider(embedding_model=self._model,
+                                              api_key=api_key,
+                                              api_base_url=base_url)
             case _:
                 from .providers.llama_index import LlamaIndexEmbeddingProvider
                 embed_api_key = kwargs.get("embedding_api_key", settings.EMBEDDING_API_KEY)
@@ -110,3 +110,10 @@ class EmbeddingManager:
         """
         provider = await self._get_embedding_provider(**kwargs)
         return await provider.embed(text)
+
+    async def embed_batch(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        """
+        Get embeddings for several texts, batched where the provider supports it.
+        """
+        provider = await self._get_embedding_provider(**kwargs)
+        return await provider.embed_batch(texts)
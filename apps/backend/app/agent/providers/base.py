@@ -1,3 +1,5 @@
+import asyncio
+
 from typing import Any
 from abc import ABC, abstractmethod
 
@@ -18,3 +20,9 @@ class EmbeddingProvider(ABC):
 
     @abstractmethod
     async def embed(self, text: str) -> list[float]: ...
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embeds several texts. Providers with a native batch endpoint override this.
+        """
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
@@ -1,6 +1,7 @@
 import aiohttp
-import json
 import logging
+import orjson
+from functools import lru_cache
 from typing import Any, Dict
 
 from ..exceptions import ProviderError
@@ -9,6 +10,47 @@ from ...core import settings
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+# batchEmbedContents accepts at most 100 requests per call
+GEMINI_EMBED_BATCH_SIZE = 100
+
+# Shared across all Gemini providers so calls reuse pooled keep-alive connections
+# instead of paying a fresh TCP+TLS handshake per request.
+_session: aiohttp.ClientSession | None = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """
+    Returns the process-wide ClientSession, creating it on first use.
+    """
+    global _session
+    if _session is None or _session.closed:
+        # The default limit=100 has been seen to cause connect/DNS failures under
+        # load against generativelanguage.googleapis.com, so size the pool explicitly.
+        connector = aiohttp.TCPConnector(
+            limit=256,
+            limit_per_host=64,
+            ttl_dns_cache=300,
+            keepalive_timeout=90,
+            enable_cleanup_closed=True,
+            force_close=False,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=300),
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """
+    Closes the shared ClientSession. Called from the app lifespan on shutdown.
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
 
 class GeminiProvider(Provider):
     """
@@ -29,38 +71,49 @@ class GeminiProvider(Provider):
         if not self.api_key:
             raise ProviderError("Gemini API key is missing")
 
-    async def __call__(self, prompt: str, **generation_args: Any) -> Dict[str, Any]:
+        self._endpoint = f"{self.api_base_url}/models/{self.model_name}:generateContent"
+        self._params = {"key": self.api_key}
+        # opts never change after construction, so the generation config is built once
+        self._gen_config = {
+            "temperature": self.opts.get("temperature", 0.2),
+            "topK": self.opts.get("top_k", 40),
+            "topP": self.opts.get("top_p", 0.9),
+            "maxOutputTokens": self.opts.get("max_output_tokens", 8192),
+        }
+        logger.info(f"✅ GeminiProvider is using max_output_tokens: {self._gen_config['maxOutputTokens']}")
+
+    async def __call__(self, prompt: str, **generation_args: Any) -> str | Dict[str, Any]:
         """
-        Calls the Gemini API with a prompt and returns parsed JSON output if possible.
+        Calls the Gemini API with a prompt and returns parsed JSON output if possible,
+        otherwise the raw response text.
         """
-        url = f"{self.api_base_url}/models/{self.model_name}:generateContent?key={self.api_key}"
-        max_tokens = self.opts.get("max_output_tokens", 8192)
-        logger.info(f"✅ GeminiProvider is using max_output_tokens: {max_tokens}")
-        payload = {
+        body = orjson.dumps({
             "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {
-                "temperature": self.opts.get("temperature", 0.2),
-                "topK": self.opts.get("top_k", 40),
-                "topP": self.opts.get("top_p", 0.9),
-                "maxOutputTokens": max_tokens
-            }
-        }
+            "generationConfig": self._gen_config,
+        })
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status != 200:
-                        text = await response.text()
-                        raise ProviderError(f"Gemini API error: {response.status} - {text}")
-
-                    data = await response.json()
-                    logger.info(f"provider in gemini response: {data}")
-                    text_output = data["candidates"][0]["content"]["parts"][0]["text"]
-
-                    try:
-                        return json.loads(text_output)
-                    except Exception:
-                        return {"text": text_output}
+            session = await _get_session()
+            async with session.post(
+                self._endpoint, params=self._params, data=body, headers=_JSON_HEADERS
+            ) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    raise ProviderError(f"Gemini API error: {response.status} - {text}")
+
+                data = orjson.loads(await response.read())
+                text_output = data["candidates"][0]["content"]["parts"][0]["text"]
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "gemini response: %d chars, usage: %r",
+                        len(text_output),
+                        data.get("usageMetadata"),
+                    )
+
+                try:
+                    return orjson.loads(text_output)
+                except orjson.JSONDecodeError:
+                    return text_output
 
         except Exception as e:
             logger.error(f"Gemini provider error: {e}")
@@ -84,19 +137,82 @@ class GeminiEmbeddingProvider(EmbeddingProvider):
         if not self.api_key:
             raise ProviderError("Gemini Embedding API key is missing")
 
+        self._endpoint = f"{self.api_base_url}/models/{self.embedding_model}:batchEmbedContents"
+        self._params = {"key": self.api_key}
+        self._model_ref = f"models/{self.embedding_model}"
+
     async def embed(self, text: str) -> list[float]:
-        url = f"{self.api_base_url}/models/{self.embedding_model}:embedContent?key={self.api_key}"
-        payload = {"content": {"parts": [{"text": text}]}}
+        return (await self.embed_batch([text]))[0]
 
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embeds texts through batchEmbedContents, one round trip per
+        GEMINI_EMBED_BATCH_SIZE texts instead of one per text.
+        """
+        embeddings: list[list[float]] = []
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
+            session = await _get_session()
+            for start in range(0, len(texts), GEMINI_EMBED_BATCH_SIZE):
+                body = orjson.dumps({
+                    "requests": [
+                        {"model": self._model_ref, "content": {"parts": [{"text": text}]}}
+                        for text in texts[start : start + GEMINI_EMBED_BATCH_SIZE]
+                    ]
+                })
+                async with session.post(
+                    self._endpoint, params=self._params, data=body, headers=_JSON_HEADERS
+                ) as response:
                     if response.status != 200:
                         text = await response.text()
                         raise ProviderError(f"Gemini Embedding API error: {response.status} - {text}")
-                    data = await response.json()
-                    return data["embedding"]["values"]
+                    data = orjson.loads(await response.read())
+                    embeddings.extend(item["values"] for item in data["embeddings"])
+            return embeddings
 
         except Exception as e:
             logger.error(f"Gemini embedding error: {e}")
             raise ProviderError(f"Gemini embedding error: {e}")
+
+
+@lru_cache(maxsize=8)
+def _cached_provider(
+    model_name: str,
+    api_key: str | None,
+    api_base_url: str | None,
+    opts_items: tuple,
+) -> GeminiProvider:
+    return GeminiProvider(
+        model_name=model_name,
+        api_key=api_key,
+        api_base_url=api_base_url,
+        opts=dict(opts_items),
+    )
+
+
+def get_provider(
+    model_name: str,
+    api_key: str | None,
+    api_base_url: str | None,
+    opts: Dict[str, Any],
+) -> GeminiProvider:
+    """
+    Returns a GeminiProvider for this configuration, reusing a previously built
+    instance when the model, credentials and options all match.
+    """
+    return _cached_provider(model_name, api_key, api_base_url, tuple(sorted(opts.items())))
+
+
+@lru_cache(maxsize=8)
+def get_embedding_provider(
+    embedding_model: str,
+    api_key: str | None,
+    api_base_url: str | None,
+) -> GeminiEmbeddingProvider:
+    """
+    Returns a cached GeminiEmbeddingProvider for this model and credentials.
+    """
+    return GeminiEmbeddingProvider(
+        embedding_model=embedding_model,
+        api_key=api_key,
+        api_base_url=api_base_url,
+    )
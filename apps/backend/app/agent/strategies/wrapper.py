@@ -1,7 +1,6 @@
-import json
 import logging
-import re
-from typing import Any, Dict, List, Tuple
+import orjson
+from typing import Any, Dict, Iterator
 
 from .base import Strategy
 from ..providers.base import Provider
@@ -10,8 +9,59 @@ from ..exceptions import StrategyError
 
 logger = logging.getLogger(__name__)
 
-# Precompiled for performance; matches ```json ... ``` or ``` ... ``` fenced blocks
-FENCE_PATTERN = re.compile(r"```(?:json)?\s*([\s\S]*?)```", re.IGNORECASE)
+FENCE = "```"
+
+
+def _iter_fenced_blocks(text: str) -> Iterator[str]:
+    """
+    Yields the bodies of ```json ... ``` or ``` ... ``` fenced blocks.
+
+    Uses a linear ``str.find`` scan instead of a backtracking regex: once an opening
+    fence has no closing fence after it, no later block can close either.
+    """
+    pos = 0
+    while True:
+        open_idx = text.find(FENCE, pos)
+        if open_idx == -1:
+            return
+        body_start = open_idx + len(FENCE)
+        if text[body_start : body_start + 4].lower() == "json":
+            body_start += 4
+        close_idx = text.find(FENCE, body_start)
+        if close_idx == -1:
+            return
+        yield text[body_start:close_idx]
+        pos = close_idx + len(FENCE)
+
+
+def _iter_json_objects(text: str) -> Iterator[str]:
+    """
+    Yields every top-level ``{...}`` span in ``text`` using a single string-aware
+    brace-depth scan, so braces inside JSON string literals are ignored.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            # Quotes only delimit strings inside an object; stray prose quotes are ignored
+            in_string = depth > 0
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield text[start : i + 1]
 
 
 class JSONWrapper(Strategy):
@@ -23,58 +73,49 @@ class JSONWrapper(Strategy):
         """
         response = await provider(prompt, **generation_args)
 
-        # --- Start Modification ---
-        # Check if the response is a dictionary and extract the text content
-        if isinstance(response, dict) and 'text' in response:
-            response_text = response['text']
-        elif isinstance(response, str):
-            response_text = response
-        else:
+        # Providers such as Gemini already hand back parsed JSON; nothing left to do.
+        # No provider wraps text in a dict, so a dict (even one with a top-level
+        # "text" field) is the structured response itself.
+        if isinstance(response, dict):
+            return response
+        if not isinstance(response, str):
             logger.error(f"Unexpected response type from provider: {type(response)}")
             raise StrategyError("Unexpected response type from provider.")
 
-        response_text = response_text.strip()
-        # --- End Modification ---
+        response_text = response.strip()
 
-        logger.info(f"provider response text: {response_text}") # Log the extracted text
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("provider response text: %s", response_text)
 
-        # 1) Try direct parse first
-        try:
-            # Use response_text instead of response
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            pass
+        # 1) Try direct parse first, but only when the text can actually start a
+        #    JSON document; fenced (```) or prose-prefixed output would just raise
+        if response_text[:1] in ("{", "["):
+            try:
+                return orjson.loads(response_text)
+            except orjson.JSONDecodeError:
+                pass
 
         # 2) If wrapped in fenced code blocks, try all and return the first valid JSON
         #    Matches ```json\n...``` or ```\n...``` variants
         # Use response_text instead of response
-        for fence_match in FENCE_PATTERN.finditer(response_text):
-            fenced = fence_match.group(1).strip()
+        for fenced in _iter_fenced_blocks(response_text):
+            fenced = fenced.strip()
             try:
-                return json.loads(fenced)
-            except json.JSONDecodeError:
+                return orjson.loads(fenced)
+            except orjson.JSONDecodeError:
                 continue
 
-        # 3) Fallback: extract the largest JSON-looking object block { ... }
-        # Use response_text instead of response
-        obj_start, obj_end = response_text.find("{"), response_text.rfind("}")
-
-        candidates: List[Tuple[int, str]] = []
-        if obj_start != -1 and obj_end != -1 and obj_end > obj_start:
-            # Use response_text instead of response
-            candidates.append((obj_start, response_text[obj_start : obj_end + 1]))
-
-        for _, candidate in candidates:
+        # 3) Fallback: parse top-level JSON-looking object blocks { ... } as the
+        #    scan finds them; they never overlap, so the first one that parses wins
+        found_candidate = False
+        for candidate in _iter_json_objects(response_text):
+            found_candidate = True
             try:
-                return json.loads(candidate)
-            except json.JSONDecodeError:
-                candidate2 = candidate.replace("```", "").strip()
-                try:
-                    return json.loads(candidate2)
-                except json.JSONDecodeError:
-                    continue
-
-        if candidates:
+                return orjson.loads(candidate)
+            except orjson.JSONDecodeError:
+                continue
+
+        if found_candidate:
             # If we had candidates but none parsed, log the last error contextfully
             # Use response_text instead of response
             _err_preview = response_text if len(response_text) <= 2000 else response_text[:2000] + "... (truncated)"
@@ -100,21 +141,18 @@ class MDWrapper(Strategy):
         """
         Wrapper strategy to format the prompt as Markdown with the help of LLM.
         """
-        logger.info(f"prompt given to provider: \n{prompt}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("prompt given to provider: \n%s", prompt)
         response = await provider(prompt, **generation_args)
 
-        # --- Start Modification for MDWrapper ---
-        # Handle potential dictionary response for MDWrapper as well
-        if isinstance(response, dict) and 'text' in response:
-            response_text = response['text']
-        elif isinstance(response, str):
-            response_text = response
-        else:
+        # Providers return generated text as a plain string
+        if not isinstance(response, str):
             logger.error(f"Unexpected response type from provider for MD: {type(response)}")
             raise StrategyError("Unexpected response type from provider for MD.")
-        # --- End Modification for MDWrapper ---
+        response_text = response
 
-        logger.info(f"provider response: {response_text}") # Log the extracted text
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("provider response: %s", response_text)
         try:
             # Use response_text instead of response
             response_text = (
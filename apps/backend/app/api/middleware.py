@@ -1,17 +1,55 @@
-from uuid import uuid4
+import os
+import re
+import random
+
 from starlette.requests import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
+# Request IDs only need to be unique, not unpredictable, so draw them from a PRNG
+# seeded once from the OS instead of paying an os.urandom() call per request.
+_rng = random.Random(os.urandom(32))
+
+
+def _reseed() -> None:
+    _rng.seed(os.urandom(32))
+
+
+# Forked workers would otherwise share the parent's PRNG state and repeat IDs
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
+
+
+def new_request_id() -> str:
+    """
+    Returns a random 128-bit request ID as 32 hex characters.
+    """
+    return f"{_rng.getrandbits(128):032x}"
+
+
+# Upper bound on a client-supplied X-Request-ID before we mint our own instead
+MAX_REQUEST_ID_LENGTH = 128
+# A client-supplied X-Request-ID is reused only if it is this strict token; it ends
+# up in every log line and the response header, so anything else (newlines,
+# spaces, separators) could inject log records or forge correlation ids
+REQUEST_ID_PATTERN = re.compile(rf"[A-Za-z0-9._-]{{1,{MAX_REQUEST_ID_LENGTH}}}")
+
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
+    """
+    Sets request.state.request_id exactly once per request, so handlers can read
+    it directly, and echoes it back in the X-Request-ID response header.
+    """
     async def dispatch(self, request: Request, call_next):
-        path_parts = request.url.path.strip("/").split("/")
+        request_id = request.headers.get("x-request-id", "")
+        if not REQUEST_ID_PATTERN.fullmatch(request_id):
+            path_parts = request.url.path.strip("/").split("/")
 
-        # Safely grab the 3rd part: /api/v1/<service>
-        service_tag = f"{path_parts[2]}:" if len(path_parts) > 2 else ""
+            # Safely grab the 3rd part: /api/v1/<service>
+            service_tag = f"{path_parts[2]}:" if len(path_parts) > 2 else ""
 
-        request_id = f"{service_tag}{uuid4()}"
+            request_id = f"{service_tag}{new_request_id()}"
         request.state.request_id = request_id
 
         response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
         return response
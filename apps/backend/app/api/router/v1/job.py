@@ -1,10 +1,8 @@
 import logging
-import traceback
 
-from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, HTTPException, Depends, Request, status, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.core import get_db_session
 from app.services import JobService, JobNotFoundError
@@ -26,7 +24,7 @@ async def upload_job(
     """
     Accepts a job description as a MarkDown text and stores it in the database.
     """
-    request_id = getattr(request.state, "request_id", str(uuid4()))
+    request_id = request.state.request_id
 
     allowed_content_types = [
         "application/json",
@@ -92,7 +90,7 @@ async def get_job(
     Raises:
         HTTPException: If the job is not found or if there's an error fetching data.
     """
-    request_id = getattr(request.state, "request_id", str(uuid4()))
+    request_id = request.state.request_id
     headers = {"X-Request-ID": request_id}
 
     try:
@@ -112,7 +110,7 @@ async def get_job(
                 message=f"Job with id {job_id} not found"
             )
 
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "request_id": request_id,
                 "data": job_data,
@@ -127,7 +125,7 @@ async def get_job(
             detail=str(e),
         )
     except Exception as e:
-        logger.error(f"Error fetching job: {str(e)} - traceback: {traceback.format_exc()}")
+        logger.exception("Error fetching job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error fetching job data",
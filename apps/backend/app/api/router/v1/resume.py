@@ -1,9 +1,9 @@
+import anyio
 import logging
-import traceback
-import uuid
-from uuid import uuid4
+
+from functools import partial
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi import (
     APIRouter,
     File,
@@ -14,7 +14,6 @@ from fastapi import (
     status,
     Query,
 )
-from typing import Dict, Any # ### NEW: Added for type hinting
 from pydantic import BaseModel, Field # ### NEW: Added for request body model
 
 from app.core import get_db_session
@@ -31,7 +30,7 @@ from app.services import (
     AtsScoringService,
     AiAtsScoringService,
 )
-from app.schemas.pydantic import ResumeImprovementRequest
+from app.schemas.pydantic import ResumeImprovementRequest, StructuredResumeModel
 
 class AtsScoreRequest(BaseModel):
     """
@@ -39,71 +38,145 @@ class AtsScoreRequest(BaseModel):
     The client will send this JSON in the request body.
     """
     resume_id: str = Field(..., description="The unique ID of the resume (from the client's DB)")
-    processed_resume_data: Dict[str, Any] = Field(..., description="The structured resume JSON fetched from the client's DB")
+    processed_resume_data: StructuredResumeModel = Field(..., description="The structured resume JSON fetched from the client's DB")
 
 
 resume_router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Both scoring services only hold read-only patterns/managers after __init__,
+# so one instance per worker is shared across requests (and scoring threads).
+_ats_scoring_service = AtsScoringService()
+_ai_ats_scoring_service = AiAtsScoringService()
+
+# (signature, window) per allowed upload: the signature must occur within the first
+# `window` bytes. PDF readers accept a short preamble (or BOM) before the header;
+# DOCX is a ZIP container and must start with the local file header.
+FILE_SIGNATURES = {
+    "application/pdf": (b"%PDF-", 1024),
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": (b"PK\x03\x04", 4),
+}
+ALLOWED_CONTENT_TYPES = frozenset(FILE_SIGNATURES)
+MAX_FILE_SIZE = 2 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Content-Length covers the whole multipart envelope (boundaries, part headers),
+# not just the file, so allow some slack before rejecting on the header alone.
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+def _reject_oversized_request(request: Request) -> None:
+    """
+    Rejects requests whose Content-Length already rules out a file within
+    MAX_FILE_SIZE, before any of the upload is read.
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File size exceeds maximum allowed size of 2.0MB.",
+        )
 
-@resume_router.post(
-    "/upload",
-    summary="Upload a resume in PDF or DOCX format and store it into DB in HTML/Markdown format",
-)
-async def upload_resume(
-    request: Request,
-    file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db_session),
-):
+
+# Known /improve failures -> (HTTP status, log level); anything else is a 500
+_IMPROVE_ERRORS = {
+    ResumeNotFoundError: (status.HTTP_500_INTERNAL_SERVER_ERROR, logging.ERROR),
+    JobNotFoundError: (status.HTTP_500_INTERNAL_SERVER_ERROR, logging.ERROR),
+    ResumeParsingError: (status.HTTP_500_INTERNAL_SERVER_ERROR, logging.ERROR),
+    JobParsingError: (status.HTTP_500_INTERNAL_SERVER_ERROR, logging.ERROR),
+    ResumeKeywordExtractionError: (status.HTTP_422_UNPROCESSABLE_ENTITY, logging.WARNING),
+    JobKeywordExtractionError: (status.HTTP_422_UNPROCESSABLE_ENTITY, logging.WARNING),
+}
+
+
+def get_resume_service(request: Request) -> ResumeService:
     """
-    (This is your original /upload endpoint, left as-is)
-    ...
+    Dependency returning the ResumeService prewarmed in the app lifespan.
     """
-# ... (existing code for /upload) ...
-    request_id = getattr(request.state, "request_id", str(uuid4()))
+    return request.app.state.resume_service
 
-    allowed_content_types = [
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-    ]
 
-    if file.content_type not in allowed_content_types:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type. Only PDF and DOCX files are allowed.",
-        )
+def get_scoring_limiter(request: Request) -> anyio.CapacityLimiter:
+    """
+    Dependency returning the thread limiter created for scoring in the app lifespan.
+    """
+    return request.app.state.scoring_limiter
 
-    MAX_FILE_SIZE = 2 * 1024 * 1024
-    
-    # Try to get size from file object or Content-Length header
-    file_size = getattr(file, 'size', None)
-    if file_size is None and hasattr(request, 'headers'):
-        content_length = request.headers.get('content-length')
-        if content_length:
-            try:
-                file_size = int(content_length)
-            except ValueError:
-                pass  # Invalid content-length header
-    
-    if file_size and file_size > MAX_FILE_SIZE:
+
+async def bounded_size(file: UploadFile, max_size: int = MAX_FILE_SIZE) -> int:
+    """
+    Returns the upload's size, rejecting it with 413 once it exceeds max_size.
+    Uses the size recorded by the multipart parser when present; otherwise counts
+    the spooled file chunk by chunk without keeping it, then rewinds it.
+    """
+    if file.size is not None:
+        size = file.size
+    else:
+        size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                break
+        await file.seek(0)
+    if size > max_size:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail="File size exceeds maximum allowed size of 2.0MB.",
         )
+    return size
 
-    file_bytes = await file.read()
-    if not file_bytes:
+
+async def validated_upload(
+    request: Request,
+    file: UploadFile = File(...),
+) -> UploadFile:
+    """
+    Dependency shared by /upload and /parse: checks the content type, size and
+    leading bytes of the uploaded PDF/DOCX. Returns the UploadFile rewound to the
+    start, so handlers can stream it instead of holding a bytes copy.
+    """
+    _reject_oversized_request(request)
+
+    if file.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only PDF and DOCX files are allowed.",
+        )
+
+    if not await bounded_size(file):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Empty file. Please upload a valid file.",
         )
 
-    # Verify size after reading
-    if len(file_bytes) > MAX_FILE_SIZE:
+    # The declared content type comes from the client; make sure the bytes agree
+    # before handing them to a converter that would only fail on them later
+    signature, window = FILE_SIGNATURES[file.content_type]
+    head = await file.read(window)
+    await file.seek(0)
+    if signature not in head:
         raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File size exceeds maximum allowed size of 2.0MB.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File content does not match its declared type. Only PDF and DOCX files are allowed.",
         )
+    return file
+
+
+@resume_router.post(
+    "/upload",
+    summary="Upload a resume in PDF or DOCX format and store it into DB in HTML/Markdown format",
+)
+async def upload_resume(
+    request: Request,
+    file: UploadFile = Depends(validated_upload),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """
+    (This is your original /upload endpoint, left as-is)
+    ...
+    """
+# ... (existing code for /upload) ...
+    request_id = request.state.request_id
+    file_bytes = await file.read()
 
     try:
         resume_service = ResumeService(db)
@@ -120,9 +193,7 @@ async def upload_resume(
             detail=str(e),
         )
     except Exception as e:
-        logger.error(
-            f"Error processing file: {str(e)} - traceback: {traceback.format_exc()}"
-        )
+        logger.exception("Error processing file: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing file: {str(e)}",
@@ -152,18 +223,16 @@ async def score_and_improve(
     ...
     """
 # ... (existing code for /improve) ...
-    request_id = getattr(request.state, "request_id", str(uuid4()))
+    request_id = request.state.request_id
     headers = {"X-Request-ID": request_id}
 
-    request_payload = payload.model_dump()
-
     try:
-        resume_id = str(request_payload.get("resume_id", ""))
+        resume_id = str(payload.resume_id)
         if not resume_id:
             raise ResumeNotFoundError(
                 message="invalid value passed in `resume_id` field, please try again with valid resume_id."
             )
-        job_id = str(request_payload.get("job_id", ""))
+        job_id = str(payload.job_id)
         if not job_id:
             raise JobNotFoundError(
                 message="invalid value passed in `job_id` field, please try again with valid job_id."
@@ -184,51 +253,21 @@ async def score_and_improve(
                 resume_id=resume_id,
                 job_id=job_id,
             )
-            return JSONResponse(
+            return ORJSONResponse(
                 content={
                     "request_id": request_id,
                     "data": improvements,
                 },
                 headers=headers,
             )
-    except ResumeNotFoundError as e:
-        logger.error(str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
-    except JobNotFoundError as e:
-        logger.error(str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
-    except ResumeParsingError as e:
-        logger.error(str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
-    except JobParsingError as e:
-        logger.error(str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
-    except ResumeKeywordExtractionError as e:
-        logger.warning(str(e))
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e),
-        )
-    except JobKeywordExtractionError as e:
-        logger.warning(str(e))
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e),
-        )
     except Exception as e:
-        logger.error(f"Error: {str(e)} - traceback: {traceback.format_exc()}")
+        # Walk the MRO so subclasses map like the except clauses this table replaced
+        mapped = next((_IMPROVE_ERRORS[cls] for cls in type(e).__mro__ if cls in _IMPROVE_ERRORS), None)
+        if mapped is not None:
+            status_code, level = mapped
+            logger.log(level, "%s", e)
+            raise HTTPException(status_code=status_code, detail=str(e))
+        logger.exception("Error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="sorry, something went wrong!",
@@ -249,7 +288,7 @@ async def get_resume(
     ...
     """
 # ... (existing code for /get) ...
-    request_id = getattr(request.state, "request_id", str(uuid4()))
+    request_id = request.state.request_id
     headers = {"X-Request-ID": request_id}
 
     try:
@@ -269,7 +308,7 @@ async def get_resume(
                 message=f"Resume with id {resume_id} not found"
             )
 
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "request_id": request_id,
                 "data": resume_data,
@@ -284,7 +323,7 @@ async def get_resume(
             detail=str(e),
         )
     except Exception as e:
-        logger.error(f"Error fetching resume: {str(e)} - traceback: {traceback.format_exc()}")
+        logger.exception("Error fetching resume: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error fetching resume data",
@@ -299,7 +338,8 @@ async def get_resume(
 )
 async def parse_resume_stateless(
     request: Request,
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(validated_upload),
+    resume_service: ResumeService = Depends(get_resume_service),
     # NO database dependency here
 ):
     """
@@ -308,37 +348,17 @@ async def parse_resume_stateless(
     and returns the structured JSON data.
     It does NOT store anything.
     """
-    request_id = getattr(request.state, "request_id", str(uuid.uuid4()))
+    request_id = request.state.request_id
+    # File type and size are already validated by the validated_upload dependency
     logger.info(f"[{request_id}] Received request for stateless parsing: {file.filename}")
 
-    # --- File Validation Logic (Copied from /upload-and-score-ats) ---
-    allowed_content_types = [
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-    ]
-    if file.content_type not in allowed_content_types:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid file type...")
-
-    MAX_FILE_SIZE = 2 * 1024 * 1024
-    file_size = getattr(file, 'size', None)
-    if file_size and file_size > MAX_FILE_SIZE:
-        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File size exceeds 2.0MB.")
-
-    file_bytes = await file.read()
-    if not file_bytes:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty file.")
-    if len(file_bytes) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File size exceeds 2.0MB.")
-    # --- End File Validation Logic ---
-
     try:
         # 1. Parse the resume (stateless)
-        resume_service = ResumeService() # Instantiate without db
         logger.info(f"[{request_id}] Parsing resume: {file.filename}")
         
         # Call the parse_resume method
         text_content, structured_data = await resume_service.parse_resume(
-            file_bytes=file_bytes,
+            file_stream=file.file,
             file_type=file.content_type,
             filename=file.filename,
         )
@@ -349,7 +369,7 @@ async def parse_resume_stateless(
         logger.info(f"[{request_id}] Resume parsed successfully.")
 
         # 2. Return ONLY the parsed data
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "message": f"File {file.filename} parsed successfully.",
                 "request_id": request_id,
@@ -366,9 +386,7 @@ async def parse_resume_stateless(
             detail=str(e), 
         )
     except Exception as e:
-        logger.error(
-            f"[{request_id}] Error processing file {file.filename}: {str(e)} - traceback: {traceback.format_exc()}"
-        )
+        logger.exception("[%s] Error processing file %s: %s", request_id, file.filename, e)
         if "File conversion failed" in str(e) or "DOCX file processing failed" in str(e):
             detail_msg = str(e)
         else:
@@ -386,9 +404,10 @@ async def parse_resume_stateless(
     summary="Calculate ATS score from provided structured resume data.",
     tags=["ATS Microservice"]
 )
-async def score_resume_from_data_stateless(
+async def score_resume_manual(
     request: Request,
     payload: AtsScoreRequest, # Use the new Pydantic model
+    limiter: anyio.CapacityLimiter = Depends(get_scoring_limiter),
 ):
     """
     API 2 (Stateless):
@@ -397,25 +416,30 @@ async def score_resume_from_data_stateless(
     - Returns the score.
     - Does NOT store anything.
     """
-    request_id = getattr(request.state, "request_id", str(uuid.uuid4()))
+    request_id = request.state.request_id
     logger.info(f"[{request_id}] Requesting ATS score for resume ID: {payload.resume_id}")
 
     try:
-        # 1. Instantiate the stateless AtsScoringService
-        ats_scoring_service = AtsScoringService()
-        
+        # 1. Use the shared, stateless AtsScoringService
+        ats_scoring_service = _ats_scoring_service
+
         logger.info(f"[{request_id}] Calculating ATS score for {payload.resume_id}")
         
-        # 2. Calculate the score using the data from the request body
-        ats_result = ats_scoring_service.calculate_ats_score(
-            resume_id=payload.resume_id, # Pass the ID from the payload
-            processed_resume_data=payload.processed_resume_data # Pass the JSON from the payload
+        # 2. Calculate the score using the data from the request body.
+        #    Scoring is CPU-bound, so keep it off the event loop.
+        ats_result = await anyio.to_thread.run_sync(
+            partial(
+                ats_scoring_service.calculate_ats_score,
+                resume_id=payload.resume_id, # Pass the ID from the payload
+                processed_resume_data=payload.processed_resume_data.model_dump(by_alias=True) # Validated JSON, keyed as the scorers expect
+            ),
+            limiter=limiter,
         )
         
         logger.info(f"[{request_id}] ATS score calculated: {ats_result.get('ats_score')}")
 
         # 3. Return the ATS score result
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "message": "ATS score calculated successfully from provided data.",
                 "request_id": request_id,
@@ -426,9 +450,7 @@ async def score_resume_from_data_stateless(
         )
         
     except Exception as e:
-        logger.error(
-            f"[{request_id}] Error scoring resume {payload.resume_id}: {str(e)} - traceback: {traceback.format_exc()}"
-        )
+        logger.exception("[%s] Error scoring resume %s: %s", request_id, payload.resume_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while calculating the score.",
@@ -441,7 +463,7 @@ async def score_resume_from_data_stateless(
     summary="Calculate ATS score from provided structured resume data.",
     tags=["ATS Microservice"]
 )
-async def score_resume_from_data_stateless(
+async def score_resume_ai(
     request: Request,
     payload: AtsScoreRequest, # Use the new Pydantic model
 ):
@@ -452,22 +474,22 @@ async def score_resume_from_data_stateless(
     - Returns the score.
     - Does NOT store anything.
     """
-    request_id = getattr(request.state, "request_id", str(uuid.uuid4()))
+    request_id = request.state.request_id
     logger.info(f"[{request_id}] Requesting AI ATS score for resume ID: {payload.resume_id}")
 
     try:
-        ai_scoring_service = AiAtsScoringService() # <-- UPDATED
+        ai_scoring_service = _ai_ats_scoring_service # <-- UPDATED
         
         logger.info(f"[{request_id}] Calculating AI ATS score for {payload.resume_id}")
         
         ats_result = await ai_scoring_service.get_ai_ats_score( # <-- UPDATED (and added await)
-            processed_resume_data=payload.processed_resume_data # Pass the JSON from the payload
+            processed_resume_data=payload.processed_resume_data.model_dump(by_alias=True) # Validated JSON, keyed as the scorers expect
         )
         
         logger.info(f"[{request_id}] AI ATS score calculated: {ats_result.get('ats_score')}")
 
         # 3. Return the ATS score result
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "message": "AI ATS score calculated successfully from provided data.",
                 "request_id": request_id,
@@ -478,9 +500,7 @@ async def score_resume_from_data_stateless(
         )
         
     except Exception as e:
-        logger.error(
-            f"[{request_id}] Error scoring resume {payload.resume_id}: {str(e)} - traceback: {traceback.format_exc()}"
-        )
+        logger.exception("[%s] Error scoring resume %s: %s", request_id, payload.resume_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while calculating the score.",
@@ -1,8 +1,10 @@
 import os
+import anyio
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
@@ -23,7 +25,17 @@ from .models import Base
 async def lifespan(app: FastAPI):
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Dedicated worker-thread budget for CPU-bound scoring, so a burst of /score
+    # calls cannot take every slot of the shared threadpool
+    app.state.scoring_limiter = anyio.CapacityLimiter(min(32, (os.cpu_count() or 1) * 2))
+    # Build the stateless ResumeService (MarkItDown converters, DOCX dependency
+    # probe) before serving, instead of on the first /parse of every worker
+    from .services import ResumeService
+    app.state.resume_service = await anyio.to_thread.run_sync(ResumeService)
     yield
+    # Release pooled Gemini HTTP connections held by the shared session
+    from .agent.providers.gemini import close_session as close_gemini_session
+    await close_gemini_session()
     await async_engine.dispose()
 
 
@@ -38,6 +50,7 @@ def create_app() -> FastAPI:
         docs_url="/api/docs",
         openapi_url="/api/openapi.json",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
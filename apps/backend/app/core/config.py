@@ -13,6 +13,9 @@ class Settings(BaseSettings):
     FRONTEND_URL: Optional[str] = None
     ALLOWED_ORIGINS: List[str] = []
     DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 1800
     PYTHONDONTWRITEBYTECODE: int = 1
     SYNC_DATABASE_URL: Optional[str] = None
     ASYNC_DATABASE_URL: Optional[str] = None
@@ -25,6 +28,10 @@ class Settings(BaseSettings):
     EMBEDDING_API_KEY: Optional[str] = None
     EMBEDDING_BASE_URL: Optional[str] = None
     EMBEDDING_MODEL: Optional[str] = "dengcao/Qwen3-Embedding-0.6B:Q8_0"
+    AI_ATS_MAX_CONCURRENCY: int = 10
+    AI_ATS_MAX_OUTPUT_TOKENS: int = 8192
+    RESUME_EXTRACTION_MAX_CONCURRENCY: int = 8
+    RESUME_EXTRACTION_MAX_SECTIONS: int = 8
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, ".env"),
@@ -28,6 +28,19 @@ class _DatabaseSettings:
         {"check_same_thread": False} if SYNC_DATABASE_URL.startswith("sqlite") else {}
     )
 
+    # Sizing for the async QueuePool on server databases, so concurrent requests
+    # reuse warm connections instead of opening new ones under load. SQLite keeps
+    # SQLAlchemy's default pool (in-memory databases cannot take these options).
+    ASYNC_POOL_ARGS = (
+        {}
+        if ASYNC_DATABASE_URL.startswith("sqlite")
+        else {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+        }
+    )
+
 
 settings = _DatabaseSettings()
 
@@ -74,6 +87,7 @@ def _make_async_engine() -> AsyncEngine:
         pool_pre_ping=True,
         connect_args=settings.DB_CONNECT_ARGS,
         future=True,
+        **settings.ASYNC_POOL_ARGS,
     )
     _configure_sqlite(engine.sync_engine)
     return engine
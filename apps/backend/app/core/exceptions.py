@@ -34,7 +34,7 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 
 
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-    logger.error(f"DB error on {request.url}: {exc} - {exc.with_traceback()}")
+    logger.error("DB error on %s: %s", request.url, exc, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -1,5 +1,79 @@
 # In: apps/backend/app/prompt/ai_ats_score.py
 
+import orjson
+
+# Shape of the JSON the model must return. Kept as data so it is serialized once,
+# compactly, instead of being sent as ~2KB of hand-indented, brace-escaped text.
+RESPONSE_SCHEMA = {
+    "ats_score": "integer (0-100)",
+    "score_breakdown_for_sidebar": {
+        "overall_score": "integer (same as ats_score)",
+        "total_issues": "integer (count of 'fail' status items)",
+        "categories": [
+            {
+                "title": "CONTENT",
+                "percentage": "integer (0-100)",
+                "sub_items": [
+                    {"text": "ATS Parse Rate", "status": "pass"},
+                    {"text": "Quantifying Impact", "status": "pass | fail"},
+                    {"text": "Repetition", "status": "info | pass | fail"},
+                    {"text": "Spelling & Grammar", "status": "pass | fail"},
+                ],
+            },
+            {
+                "title": "SECTION",
+                "percentage": "integer (0-100)",
+                "sub_items": [
+                    {"text": "Essential Sections", "status": "pass | fail"},
+                    {"text": "Contact Information", "status": "pass | fail"},
+                ],
+            },
+            {
+                "title": "ATS ESSENTIALS",
+                "percentage": "integer (0-100)",
+                "sub_items": [
+                    {"text": "File Format & Size", "status": "pass"},
+                    {"text": "Design", "status": "info"},
+                    {"text": "Email Address", "status": "pass | fail"},
+                    {"text": "Hyperlink in Header", "status": "pass | fail | info"},
+                ],
+            },
+            {
+                "title": "TAILORING",
+                "percentage": None,
+                "sub_items": [
+                    {"text": "Hard Skills", "status": "info"},
+                    {"text": "Soft Skills", "status": "info"},
+                    {"text": "Action Verbs", "status": "info"},
+                    {"text": "Tailored Title", "status": "info"},
+                ],
+            },
+        ],
+    },
+    "report_details": [
+        {
+            "id": "string (e.g., 'summary')",
+            "icon": "string (emoji)",
+            "title": "string (e.g., 'Summary')",
+            "status": "string (e.g., 'Strong', 'Needs Improvement')",
+            "color": "string (e.g., 'success', 'error')",
+            "points": [
+                {"text": "string (pass/fail point)", "isGood": "boolean"}
+            ],
+            "ai_suggestions": [
+                "string (simple suggestion)",
+                "or",
+                {
+                    "title": "string (e.g., 'Add Impact')",
+                    "original": "string (bad example from resume)",
+                    "upgraded": "string (your rewritten, better version)",
+                },
+            ],
+        }
+    ],
+}
+RESPONSE_SCHEMA_JSON = orjson.dumps(RESPONSE_SCHEMA).decode()
+
 PROMPT = """
 You are an expert ATS resume reviewer and career coach. Your task is to analyze a JSON object containing a candidate's processed resume data and return a detailed, structured JSON response for a "Resume Report" UI.
 
@@ -13,76 +87,26 @@ You are an expert ATS resume reviewer and career coach. Your task is to analyze
     * **Generate AI Suggestions:** For any section that "Needs Improvement," find a *specific example* from the provided resume data and create a complex suggestion object: `{{"title": "AI Suggestion Title", "original": "The bad text from the resume", "upgraded": "Your rewritten, improved version"}}`. If the suggestion is simple (like "Add a missing section"), just provide a text string.
 5.  **JSON Format:** You MUST return **only** a valid JSON object matching the `JSON_RESPONSE_SCHEMA` provided below. Do not include any other text, greetings, or explanations.
 
+**JSON_RESPONSE_SCHEMA (Your output MUST match this):**
+""" + RESPONSE_SCHEMA_JSON.replace("{", "{{").replace("}", "}}") + """
+
 **USER RESUME DATA:**
 {processed_resume_data_json}
+"""
 
-**JSON_RESPONSE_SCHEMA (Your output MUST match this):**
-{{
-  "ats_score": "integer (0-100)",
-  "score_breakdown_for_sidebar": {{
-    "overall_score": "integer (same as ats_score)",
-    "total_issues": "integer (count of 'fail' status items)",
-    "categories": [
-      {{
-        "title": "CONTENT",
-        "percentage": "integer (0-100)",
-        "sub_items": [
-          {{"text": "ATS Parse Rate", "status": "pass"}},
-          {{"text": "Quantifying Impact", "status": "pass | fail"}},
-          {{"text": "Repetition", "status": "info | pass | fail"}},
-          {{"text": "Spelling & Grammar", "status": "pass | fail"}}
-        ]
-      }},
-      {{
-        "title": "SECTION",
-        "percentage": "integer (0-100)",
-        "sub_items": [
-          {{"text": "Essential Sections", "status": "pass | fail"}},
-          {{"text": "Contact Information", "status": "pass | fail"}}
-        ]
-      }},
-      {{
-        "title": "ATS ESSENTIALS",
-        "percentage": "integer (0-100)",
-        "sub_items": [
-          {{"text": "File Format & Size", "status": "pass"}},
-          {{"text": "Design", "status": "info"}},
-          {{"text": "Email Address", "status": "pass | fail"}},
-          {{"text": "Hyperlink in Header", "status": "pass | fail | info"}}
-        ]
-      }},
-      {{
-        "title": "TAILORING",
-        "percentage": null,
-        "sub_items": [
-          {{"text": "Hard Skills", "status": "info"}},
-          {{"text": "Soft Skills", "status": "info"}},
-          {{"text": "Action Verbs", "status": "info"}},
-          {{"text": "Tailored Title", "status": "info"}}
-        ]
-      }}
-    ]
-  }},
-  "report_details": [
-    {{
-      "id": "string (e.g., 'summary')",
-      "icon": "string (emoji)",
-      "title": "string (e.g., 'Summary')",
-      "status": "string (e.g., 'Strong', 'Needs Improvement')",
-      "color": "string (e.g., 'success', 'error')",
-      "points": [
-        {{"text": "string (pass/fail point)", "isGood": "boolean"}}
-      ],
-      "ai_suggestions": [
-        "string (simple suggestion)",
-        "or",
-        {{
-          "title": "string (e.g., 'Add Impact')",
-          "original": "string (bad example from resume)",
-          "upgraded": "string (your rewritten, better version)"
-        }}
-      ]
-    }}
-  ]
-}}
-"""
\ No newline at end of file
+# The resume JSON is the only per-call part and sits at the very end, so every
+# request shares the same instructions+schema prefix for provider prompt caching.
+# PROMPT has a single substitution point; split it once so building a prompt is
+# plain concatenation instead of a str.format pass over the whole template. The
+# {{ }} escapes only exist for str.format, so undo them here.
+PREFIX, SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}")
+    for part in PROMPT.split("{processed_resume_data_json}")
+)
+
+
+def build_prompt(processed_resume_data_json: str) -> str:
+    """
+    Equivalent to PROMPT.format(processed_resume_data_json=...).
+    """
+    return PREFIX + processed_resume_data_json + SUFFIX
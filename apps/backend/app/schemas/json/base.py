@@ -1,6 +1,7 @@
+import json
 import pkgutil
 import importlib
-from typing import Dict
+from typing import Dict, Tuple
 
 from app.schemas.json import __path__ as schema_pkg_path
 
@@ -8,6 +9,8 @@ from app.schemas.json import __path__ as schema_pkg_path
 class JSONSchemaFactory:
     def __init__(self) -> None:
         self._schema: Dict[str, str] = {}
+        self._serialized: Dict[str, str] = {}
+        self._serialized_subsets: Dict[Tuple[str, Tuple[str, ...]], str] = {}
         self._discover()
 
     def _discover(self) -> None:
@@ -29,3 +32,27 @@ class JSONSchemaFactory:
             raise KeyError(
                 f"SCHEMA '{name}' not found. Available schemas: {list(self._schema.keys())}"
             )
+
+    def get_serialized(self, name: str) -> str:
+        """
+        Returns the schema as the indented JSON text spliced into prompts. The
+        schemas are static, so each one is serialized once and then reused.
+        """
+        try:
+            return self._serialized[name]
+        except KeyError:
+            serialized = self._serialized[name] = json.dumps(self.get(name), indent=2)
+            return serialized
+
+    def get_serialized_subset(self, name: str, keys: Tuple[str, ...]) -> str:
+        """
+        Like get_serialized, but only with the given top-level keys (kept in schema
+        order), for prompts that extract one part of a document. Cached per key set.
+        """
+        cache_key = (name, keys)
+        try:
+            return self._serialized_subsets[cache_key]
+        except KeyError:
+            subset = {key: value for key, value in self.get(name).items() if key in keys}
+            serialized = self._serialized_subsets[cache_key] = json.dumps(subset, indent=2)
+            return serialized
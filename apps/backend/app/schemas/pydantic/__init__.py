@@ -1,10 +1,12 @@
 from .job import JobUploadRequest
+from .ai_ats_report import AiAtsReportModel
 from .structured_job import StructuredJobModel
 from .resume_preview import ResumePreviewerModel
 from .structured_resume import StructuredResumeModel
 from .resume_improvement import ResumeImprovementRequest
 
 __all__ = [
+    "AiAtsReportModel",
     "JobUploadRequest",
     "ResumePreviewerModel",
     "StructuredResumeModel",
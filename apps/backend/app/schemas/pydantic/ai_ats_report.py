@@ -0,0 +1,14 @@
+from typing import Any, Dict, List
+from pydantic import BaseModel, ConfigDict
+
+
+class AiAtsReportModel(BaseModel):
+    """
+    Top-level shape of the report returned by the AI ATS prompt. Nested sidebar and
+    card contents are passed through as-is; extra keys from the model are kept.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    ats_score: int
+    score_breakdown_for_sidebar: Dict[str, Any]
+    report_details: List[Any]
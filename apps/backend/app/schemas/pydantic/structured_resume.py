@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator # Import field_validator
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # Make city and country optional within Location
@@ -11,26 +11,16 @@ class Location(BaseModel):
 class PersonalData(BaseModel):
     firstName: str = Field(..., alias="firstName") # Required
     lastName: Optional[str] = Field(None, alias="lastName") # Keep Optional
-    email: str = Field(...) # Required
+    email: str = Field(...) # Required; serves as the minimum contact method
     phone: Optional[str] = None # Make Optional
     linkedin: Optional[str] = None
     portfolio: Optional[str] = None
     location: Optional[Location] = None # Make Optional
 
-    # Add a validator to ensure at least one contact method besides name exists
-    @field_validator('email', 'phone', 'linkedin', check_fields=False)
-    def check_at_least_one_contact(cls, v, values):
-        # This is a simplified check running after initial field validation
-        # A more robust check might use a model_validator
-        # Check if at least one contact field (email, phone, linkedin) has a value
-        if not v and not values.data.get('phone') and not values.data.get('linkedin'):
-             # This check is basic; Pydantic v2 might need a model_validator for complex cross-field checks
-             # For now, we mainly rely on 'email' being required.
-             pass # Let the required 'email' handle the minimum contact info
-        return v
-
 
 class Experience(BaseModel):
+    model_config = ConfigDict(validate_by_name=True)
+
     job_title: Optional[str] = Field(None, alias="jobTitle") # Make Optional
     company: Optional[str] = None # Make Optional
     location: Optional[str] = None # Already Optional
@@ -44,6 +34,8 @@ class Experience(BaseModel):
 
 
 class Project(BaseModel):
+    model_config = ConfigDict(validate_by_name=True)
+
     project_name: Optional[str] = Field(None, alias="projectName") # Make Optional
     description: Optional[str] = None # Make Optional
     # Allow empty list
@@ -54,6 +46,8 @@ class Project(BaseModel):
 
 
 class Skill(BaseModel):
+    model_config = ConfigDict(validate_by_name=True)
+
     category: Optional[str] = None # Make Optional
     skill_name: Optional[str] = Field(None, alias="skillName") # Make Optional
 
@@ -67,6 +61,8 @@ class ResearchWork(BaseModel):
 
 
 class Education(BaseModel):
+    model_config = ConfigDict(validate_by_name=True)
+
     institution: Optional[str] = None # Make Optional
     degree: Optional[str] = None # Make Optional
     field_of_study: Optional[str] = Field(None, alias="fieldOfStudy")
@@ -76,15 +72,21 @@ class Education(BaseModel):
     description: Optional[str] = None
 
 class Language(BaseModel):
+    model_config = ConfigDict(validate_by_name=True)
+
     language_name: Optional[str] = Field(None, alias="languageName")
     proficiency: Optional[str] = None
 
 class Certification(BaseModel):
+    model_config = ConfigDict(validate_by_name=True)
+
     name: Optional[str] = None            # Name of the certification
     issuer: Optional[str] = None          # Issuing organization
     date_obtained: Optional[str] = Field(None, alias="dateObtained")
 
 class StructuredResumeModel(BaseModel):
+    model_config = ConfigDict(validate_by_name=True, str_strip_whitespace=True)
+
     # Require Personal Data block, but allow it to be partially filled
     personal_data: PersonalData = Field(..., alias="Personal Data")
     # Add Profile Summary here
@@ -103,7 +105,3 @@ class StructuredResumeModel(BaseModel):
     extracted_keywords: List[str] = Field(
         default_factory=list, alias="Extracted Keywords"
     )
-
-    class ConfigDict:
-        validate_by_name = True
-        str_strip_whitespace = True
\ No newline at end of file
@@ -1,13 +1,37 @@
 # In: apps/backend/app/services/ai_ats_scoring_service.py
+import asyncio
+import hashlib
 import logging
 import json
+import orjson
+from functools import partial
 from typing import Dict, Any
+from fastapi.concurrency import run_in_threadpool
 from app.agent import AgentManager
-from app.prompt import prompt_factory
+from app.core import settings
+from app.prompt.ai_ats_score import build_prompt
+from app.schemas.pydantic import AiAtsReportModel
+from .cache import ResponseCache
 from json_repair import repair_json  # Good for safety
 
 logger = logging.getLogger(__name__)
 
+# Caps in-flight AI scoring calls per worker so a burst of /ai-score requests
+# queues here instead of tripping the provider's rate limits. asyncio primitives
+# bind to the running loop on first use, so module scope is safe.
+_LLM_SEM = asyncio.Semaphore(settings.AI_ATS_MAX_CONCURRENCY)
+
+
+def resume_cache_key(processed_resume_data: Dict[str, Any]) -> str:
+    """
+    Stable digest of the resume payload, independent of dict key order.
+    """
+    return hashlib.blake2b(
+        orjson.dumps(processed_resume_data, option=orjson.OPT_SORT_KEYS),
+        digest_size=16,
+    ).hexdigest()
+
+
 class AiAtsScoringService:
     """
     Calls the Gemini AI provider to generate an ATS score and suggestions
@@ -19,47 +43,77 @@ class AiAtsScoringService:
         # This will automatically use your configured Gemini provider
         # and the JSONWrapper strategy.
         self.json_agent_manager = AgentManager(strategy="json")
+        self.cache = ResponseCache()
+        # key -> task currently scoring that payload, shared by duplicate callers
+        self._inflight: Dict[str, asyncio.Task] = {}
 
     async def get_ai_ats_score(self, processed_resume_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Generates an AI-powered ATS score and report.
+        Generates an AI-powered ATS score and report. Successful reports are cached
+        by payload, so an identical resume is not sent to the model again.
         """
         resume_id = processed_resume_data.get("Personal Data", {}).get("email", "unknown_resume")
         logger.info(f"Generating AI ATS score for: {resume_id}")
 
+        key = resume_cache_key(processed_resume_data)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Returning cached AI ATS score for: {resume_id}")
+            return cached
+
+        # Single-flight: concurrent requests for the same payload await one model call.
+        # shield() keeps a disconnecting caller from cancelling it for the others.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate_ai_ats_score(processed_resume_data, resume_id))
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._finish_inflight, key))
+        else:
+            logger.info(f"Joining in-flight AI ATS scoring for: {resume_id}")
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        # Error reports are not cached so the next request retries the model
+        if "error" not in result:
+            self.cache.set(key, result)
+
+    async def _generate_ai_ats_score(self, processed_resume_data: Dict[str, Any], resume_id: str) -> Dict[str, Any]:
+        """
+        Builds the prompt and calls the model for one resume.
+        """
         try:
-            # 1. Get the new prompt template
-            prompt_template = prompt_factory.get("ai_ats_score")
+            # 1. Serialize the resume data (compact: indentation only costs input tokens)
+            resume_data_json = orjson.dumps(processed_resume_data).decode()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Resume data JSON: %s", resume_data_json)
 
-            # 2. Format the prompt with the resume data
-            resume_data_json = json.dumps(processed_resume_data, indent=2)
-            logger.info(f"Resume data JSON: {resume_data_json}")
-            prompt = prompt_template.format(processed_resume_data_json=resume_data_json)
+            # 2. Splice it into the pre-split ATS prompt template
+            prompt = build_prompt(resume_data_json)
 
             # 3. Call Gemini via the AgentManager
             logger.debug("Sending prompt to AI for scoring...")
-            # Set high max tokens, as this JSON response can be large
-            raw_output = await self.json_agent_manager.run(
-                prompt=prompt,
-                max_tokens=8192,
-                max_output_tokens=8192,
-                num_predict=8192  # for ollama
-            )
+            # Set high max tokens, as this JSON response can be large. This is only a
+            # ceiling: generation stops at end of output, and a truncated report is unusable.
+            max_output_tokens = settings.AI_ATS_MAX_OUTPUT_TOKENS
+            if _LLM_SEM.locked():
+                logger.debug("AI scoring concurrency limit reached; waiting for a slot...")
+            async with _LLM_SEM:
+                raw_output = await self.json_agent_manager.run(
+                    prompt=prompt,
+                    max_tokens=max_output_tokens,
+                    max_output_tokens=max_output_tokens,
+                    num_predict=max_output_tokens  # for ollama
+                )
             logger.debug("Received raw output from AI.")
 
-            # 4. The JSONWrapper (default for AgentManager) should return a dict.
-            # We add a fallback just in case.
-            if isinstance(raw_output, dict):
-                logger.info("AI response parsed as dict successfully.")
-                return raw_output
-
-            # Fallback: If output is a string, try to repair and parse it
-            logger.warning("AI output was not a dict,attempting json_repair...")
-            repaired_json_string = repair_json(str(raw_output))
-            parsed_json = json.loads(repaired_json_string)
-
-            logger.info("AI response repaired and parsed successfully.")
-            return parsed_json
+            # 4. Parse the output and check it has the report's top-level shape once
+            #    here, so a malformed reply becomes an error report (and is not cached)
+            report = AiAtsReportModel.model_validate(await self._parse_output(raw_output))
+            return report.model_dump()
 
         except Exception as e:
             logger.error(f"Error during AI score generation for {resume_id}: {e}",
@@ -70,4 +124,39 @@ class AiAtsScoringService:
                 "error": f"Failed to generate AI score: {str(e)}",
                 "score_breakdown_for_sidebar": {},
                 "report_details": []
-            }
\ No newline at end of file
+            }
+
+    async def _parse_output(self, raw_output: Any) -> Any:
+        """
+        Turns the agent output into a parsed JSON value, repairing it if needed.
+        """
+        # The JSONWrapper (default for AgentManager) should return a dict.
+        # We add a fallback just in case.
+        if isinstance(raw_output, dict):
+            logger.info("AI response parsed as dict successfully.")
+            return raw_output
+
+        # Fallback: If output is a string, try a strict parse before repairing it
+        # (e.g. a report that was JSON-encoded twice)
+        if isinstance(raw_output, str):
+            try:
+                parsed_json = orjson.loads(raw_output)
+            except orjson.JSONDecodeError:
+                pass
+            else:
+                if isinstance(parsed_json, dict):
+                    logger.info("AI response parsed from string successfully.")
+                    return parsed_json
+
+        logger.warning("AI output was not a dict,attempting json_repair...")
+        # The text is known not to be valid JSON here, so skip json_repair's own
+        # json.loads attempt and take the repaired object directly. json_repair is
+        # pure Python and slow on a full-size reply, so keep it off the event loop.
+        parsed_json = await run_in_threadpool(
+            repair_json, str(raw_output), return_objects=True, skip_json_loads=True
+        )
+        if isinstance(parsed_json, str):
+            parsed_json = json.loads(parsed_json)
+
+        logger.info("AI response repaired and parsed successfully.")
+        return parsed_json
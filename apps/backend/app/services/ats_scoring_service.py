@@ -2,8 +2,9 @@
 
 import logging
 import re
+from itertools import chain
+from operator import itemgetter
 from typing import Dict, Any, List, Tuple, Optional
-from collections import Counter # For finding most common date format
 import json # Ensure json is imported
 import math # Ensure math is imported
 
@@ -13,6 +14,118 @@ logger = logging.getLogger(__name__)
 THRESHOLD_GOOD = 80 # Percentage score to be considered 'Good' or 'Strong' / Pass
 THRESHOLD_MEDIUM = 60 # Percentage score to be considered 'Okay' / Pass
 
+# Every criterion's details dict carries both keys once scored
+score_and_max = itemgetter("score", "max")
+
+
+def calculate_percentage(score: Optional[float], max_score: Optional[float]) -> int | None:
+    """Score as a whole percentage of max_score (rounded up, clamped to 0-100)."""
+    if score is None or max_score is None or max_score == 0:
+        return None
+    return math.ceil(min(max(score / max_score, 0), 1) * 100)
+
+
+def get_status_color_perc(percentage: int | None) -> Tuple[int | None, str, str]:
+    """Card (percentage, status, color) for a precomputed criterion percentage."""
+    if percentage is None:
+        return None, "Info", "default"
+    if percentage >= THRESHOLD_GOOD: return percentage, "Strong", "success"
+    if percentage >= THRESHOLD_MEDIUM: return percentage, "Okay", "warning"
+    return percentage, "Needs Improvement", "error"
+
+
+# --- Action Verbs, Regex Patterns, etc. ---
+# Compiled once per process at import; the service only reads them.
+ACTION_VERBS = [
+    "accelerated", "accomplished", "achieved", "acted", "adapted", "added",
+    "addressed", "administered", "advised", "allocated", "analyzed", "appraised",
+    "approved", "arbitrated", "arranged", "assembled", "assessed", "assigned",
+    "assisted", "attained", "audited", "authored", "balanced", "broadened",
+    "budgeted", "calculated", "cataloged", "centralized", "chaired", "changed",
+    "clarified", "classified", "coached", "collaborated", "collected",
+    "communicated", "compiled", "completed", "composed", "computed",
+    "conceptualized", "conceived", "concluded", "conducted", "consolidated",
+    "constructed", "contracted", "controlled", "convinced", "coordinated",
+    "corresponded", "counseled", "created", "critiqued", "customized",
+    "defined", "delegated", "delivered", "demonstrated", "demystified",
+    "derived", "designed", "determined", "developed", "devised", "diagnosed",
+    "directed", "discovered", "dispatched", "documented", "drafted", "earned",
+    "edited", "educated", "enabled", "encouraged", "engineered", "energized",
+    "enhanced", "enlisted", "ensured", "established", "evaluated", "examined",
+    "executed", "expanded", "expedited", "explained", "extracted", "fabricated",
+    "facilitated", "familiarized", "fashioned", "forecasted", "formed",
+    "formulated", "founded", "gained", "gathered", "generated", "guided",
+    "handled", "headed", "identified", "illustrated", "impacted", "implemented",
+    "improved", "increased", "influenced", "informed", "initiated", "inspected",
+    "installed", "instituted", "instructed", "integrated", "interpreted",
+    "interviewed", "introduced", "invented", "investigated", "launched",
+    "lectured", "led", "liaised", "maintained", "managed", "marketed",
+    "mastered", "maximized", "mediated", "minimized", "modeled", "moderated",
+    "monitored", "motivated", "negotiated", "operated", "optimized",
+    "orchestrated", "organized", "originated", "overhauled", "oversaw",
+    "participated", "performed", "persuaded", "planned", "predicted",
+    "prepared", "presented", "prioritized", "processed", "produced",
+    "programmed", "projected", "promoted", "proposed", "proved", "provided",
+    "publicized", "published", "purchased", "recommended", "reconciled",
+    "recorded", "recruited", "redesigned", "reduced", "referred", "regulated",
+    "rehabilitated", "reinforced", "remodeled", "reorganized", "repaired",
+    "reported", "represented", "researched", "resolved", "retrieved",
+    "reviewed", "revised", "revitalized", "rewrote", "scheduled", "screened",
+    "selected", "served", "set goals", "shaped", "simplified", "sold",
+    "solved", "spoke", "spearheaded", "specified", "standardized", "steered",
+    "stimulated", "streamlined", "strengthened", "structured", "studied",
+    "suggested", "summarized", "supervised", "supported", "surpassed",
+    "surveyed", "synthesized", "systematized", "tabulated", "taught",
+    "tested", "trained", "translated", "unified", "updated", "upgraded",
+    "utilized", "validated", "verbalized", "verified", "visualized", "wrote"
+]
+ACTION_VERBS_SET = frozenset(ACTION_VERBS)
+COMMON_ADVERBS = frozenset([
+    "successfully", "effectively", "consistently", "significantly",
+    "actively", "greatly", "strongly", "directly"
+])
+NUMBER_PATTERN = re.compile(
+    r'\d+%?|'
+    r'\$\d{1,3}(?:,\d{3})*(?:\.\d+)?|'
+    r'\b\d+\b(?!\s*-\s*\d)(?:\s*(?:million|thousand|hundred|billion|k))?|'
+    r'\b(?:over|under|approx(?:imately)?|more than|less than|up to)\s+\d+\b',
+    re.IGNORECASE
+)
+# NUMBER_PATTERN's first branch is a bare \d+, so a bullet matches it exactly when it
+# contains a digit; the scorer only needs that yes/no, so it searches for one digit
+DIGIT_PATTERN = re.compile(r"\d")
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+PHONE_PATTERN = re.compile(r"[\d\s\-\+\(\).]{7,}")
+# Grammar patterns are searched against the already-lowercased bullet, which is
+# cheaper than IGNORECASE case-folding every character inside the engine
+PASSIVE_VOICE_PATTERN = re.compile(r'\b(?:am|is|are|was|were|been|being)\s+\w+ed\b')
+FILLER_WORDS_PATTERN = re.compile(r'\b(?:responsible for|duties included|assisted with|worked on|involved in)\b')
+# bytes twins for ASCII-only bullets (the usual case): \b and \w agree with the str
+# patterns on ASCII text, and bytes matching skips walking code points
+PASSIVE_VOICE_PATTERN_ASCII = re.compile(PASSIVE_VOICE_PATTERN.pattern.encode())
+FILLER_WORDS_PATTERN_ASCII = re.compile(FILLER_WORDS_PATTERN.pattern.encode())
+# Accepts a date string and classifies it in the same match: the matched group's
+# index (lastindex) identifies the category. Text that merely starts with
+# "present" is accepted too (lastindex None), but has no category.
+DATE_FORMAT_PATTERN = re.compile(
+    r"^(?:(?P<PRESENT>present)$|(?P<YMD>\d{4}-\d{2}-\d{2})$|(?P<YM>\d{4}-\d{2})$"
+    r"|(?P<MY>\d{2}/\d{4})$|(?P<MonY>\w+\s+\d{4})$|present)",
+    re.IGNORECASE
+)
+PRESENT_SLOT = 1
+# (data key, display name) pairs checked for section completeness
+SECTIONS_TO_CHECK = (
+    ("Personal Data", "Personal Data"), ("Profile Summary", "Profile Summary"),
+    ("Experiences", "Experience"), ("Education", "Education"), ("Skills", "Skills"),
+    ("Projects", "Projects"),
+)
+# (passed-list entry, name shown when it is missing) pairs for the suggestions
+MISSING_SECTION_HINTS = (
+    ("Personal Data", "Contact Info"), ("Experience", "Work Experience/Projects"),
+    ("Education", "Education"), ("Skills", "Skills"), ("Projects", "Projects"),
+)
+MISSING_CONTACT_HINTS = (("Email (Valid Format)", "valid Email"), ("Phone (Found)", "Phone Number"))
+
 
 class AtsScoringService:
     """
@@ -20,69 +133,25 @@ class AtsScoringService:
     Returns structured output specifically for the frontend report UI.
     DB-less and embedding-less.
     """
+    # Class-level aliases of the module constants, so methods keep using self.<name>
+    action_verbs_list = ACTION_VERBS
+    action_verbs_set = ACTION_VERBS_SET
+    common_adverbs = COMMON_ADVERBS
+    number_pattern = NUMBER_PATTERN
+    digit_pattern = DIGIT_PATTERN
+    email_pattern = EMAIL_PATTERN
+    phone_pattern = PHONE_PATTERN
+    passive_voice_pattern = PASSIVE_VOICE_PATTERN
+    filler_words_pattern = FILLER_WORDS_PATTERN
+    passive_voice_pattern_ascii = PASSIVE_VOICE_PATTERN_ASCII
+    filler_words_pattern_ascii = FILLER_WORDS_PATTERN_ASCII
+    date_format_pattern = DATE_FORMAT_PATTERN
+    sections_to_check = SECTIONS_TO_CHECK
+    missing_section_hints = MISSING_SECTION_HINTS
+    missing_contact_hints = MISSING_CONTACT_HINTS
+
     def __init__(self):
         logger.info("ATS Scoring Service initialized (DB-less)")
-        # --- Action Verbs, Regex Patterns, etc. ---
-        self.action_verbs_list = [
-            "accelerated", "accomplished", "achieved", "acted", "adapted", "added",
-            "addressed", "administered", "advised", "allocated", "analyzed", "appraised",
-            "approved", "arbitrated", "arranged", "assembled", "assessed", "assigned",
-            "assisted", "attained", "audited", "authored", "balanced", "broadened",
-            "budgeted", "calculated", "cataloged", "centralized", "chaired", "changed",
-            "clarified", "classified", "coached", "collaborated", "collected",
-            "communicated", "compiled", "completed", "composed", "computed",
-            "conceptualized", "conceived", "concluded", "conducted", "consolidated",
-            "constructed", "contracted", "controlled", "convinced", "coordinated",
-            "corresponded", "counseled", "created", "critiqued", "customized",
-            "defined", "delegated", "delivered", "demonstrated", "demystified",
-            "derived", "designed", "determined", "developed", "devised", "diagnosed",
-            "directed", "discovered", "dispatched", "documented", "drafted", "earned",
-            "edited", "educated", "enabled", "encouraged", "engineered", "energized",
-            "enhanced", "enlisted", "ensured", "established", "evaluated", "examined",
-            "executed", "expanded", "expedited", "explained", "extracted", "fabricated",
-            "facilitated", "familiarized", "fashioned", "forecasted", "formed",
-            "formulated", "founded", "gained", "gathered", "generated", "guided",
-            "handled", "headed", "identified", "illustrated", "impacted", "implemented",
-            "improved", "increased", "influenced", "informed", "initiated", "inspected",
-            "installed", "instituted", "instructed", "integrated", "interpreted",
-            "interviewed", "introduced", "invented", "investigated", "launched",
-            "lectured", "led", "liaised", "maintained", "managed", "marketed",
-            "mastered", "maximized", "mediated", "minimized", "modeled", "moderated",
-            "monitored", "motivated", "negotiated", "operated", "optimized",
-            "orchestrated", "organized", "originated", "overhauled", "oversaw",
-            "participated", "performed", "persuaded", "planned", "predicted",
-            "prepared", "presented", "prioritized", "processed", "produced",
-            "programmed", "projected", "promoted", "proposed", "proved", "provided",
-            "publicized", "published", "purchased", "recommended", "reconciled",
-            "recorded", "recruited", "redesigned", "reduced", "referred", "regulated",
-            "rehabilitated", "reinforced", "remodeled", "reorganized", "repaired",
-            "reported", "represented", "researched", "resolved", "retrieved",
-            "reviewed", "revised", "revitalized", "rewrote", "scheduled", "screened",
-            "selected", "served", "set goals", "shaped", "simplified", "sold",
-            "solved", "spoke", "spearheaded", "specified", "standardized", "steered",
-            "stimulated", "streamlined", "strengthened", "structured", "studied",
-            "suggested", "summarized", "supervised", "supported", "surpassed",
-            "surveyed", "synthesized", "systematized", "tabulated", "taught",
-            "tested", "trained", "translated", "unified", "updated", "upgraded",
-            "utilized", "validated", "verbalized", "verified", "visualized", "wrote"
-        ]
-        self.action_verbs_set = set(self.action_verbs_list)
-        self.common_adverbs = set([
-            "successfully", "effectively", "consistently", "significantly",
-            "actively", "greatly", "strongly", "directly"
-        ])
-        self.number_pattern = re.compile(
-             r'\d+%?|'
-             r'\$\d{1,3}(?:,\d{3})*(?:\.\d+)?|'
-             r'\b\d+\b(?!\s*-\s*\d)(?:\s*(?:million|thousand|hundred|billion|k))?|'
-             r'\b(?:over|under|approx(?:imately)?|more than|less than|up to)\s+\d+\b',
-             re.IGNORECASE
-        )
-        self.email_pattern = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
-        self.phone_pattern = re.compile(r"[\d\s\-\+\(\).]{7,}")
-        self.passive_voice_pattern = re.compile(r'\b(am|is|are|was|were|been|being)\s+\w+ed\b', re.IGNORECASE)
-        self.filler_words_pattern = re.compile(r'\b(responsible for|duties included|assisted with|worked on|involved in)\b', re.IGNORECASE)
-        self.date_format_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$|^\d{4}-\d{2}$|^\d{2}/\d{4}$|^\w+\s+\d{4}$|Present", re.IGNORECASE)
 
 
     def calculate_ats_score(self, resume_id: str, processed_resume_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -91,11 +160,14 @@ class AtsScoringService:
         """
         logger.info(f"Calculating ATS score for resume_id: {resume_id}")
 
-        try:
-            data_string = json.dumps(processed_resume_data, indent=2, ensure_ascii=False)
-            logger.debug(f"--- Received processed_resume_data for {resume_id}: ---\n{data_string}") # DEBUG Level
-        except Exception as e:
-            logger.error(f"Error logging processed_resume_data: {e}")
+        # The JSON dumps below walk the whole resume; only pay for them when DEBUG is on
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            try:
+                logger.debug("--- Received processed_resume_data for %s: ---\n%s", resume_id,
+                             json.dumps(processed_resume_data, indent=2, ensure_ascii=False))
+            except Exception as e:
+                logger.error(f"Error logging processed_resume_data: {e}")
 
         if not processed_resume_data:
              logger.warning(f"Processed resume data is empty for {resume_id}.")
@@ -109,13 +181,17 @@ class AtsScoringService:
             criteria_scores = self._calculate_criteria_scores(processed_resume_data)
 
             # --- Step 2: Calculate Final Score ---
-            total_score = sum(details.get("score", 0) for details in criteria_scores.values())
-            max_score = sum(details.get("max", 0) for details in criteria_scores.values())
-            if max_score != 100: logger.warning(f"Max possible score from criteria_scores is {max_score}, not 100.")
+            # Every criterion carries "score" and "max", so subscript them directly
+            total_score = sum(details["score"] for details in criteria_scores.values())
+            # Sanity check on the static criteria table; compiled out under python -O
+            if __debug__:
+                max_score = sum(details["max"] for details in criteria_scores.values())
+                if max_score != 100: logger.warning(f"Max possible score from criteria_scores is {max_score}, not 100.")
 
             final_score = int(round(min(max(0, total_score), 100)))
             logger.info(f"Raw ATS Score calculated for {resume_id}: {final_score}")
-            logger.debug(f"Score breakdown used for structuring: {json.dumps(criteria_scores, indent=2)}")
+            if debug_enabled:
+                logger.debug("Score breakdown used for structuring: %s", json.dumps(criteria_scores, indent=2))
 
             # --- Step 3: Generate text suggestions ---
             suggestions = self._generate_structured_suggestions(criteria_scores, final_score, processed_resume_data)
@@ -149,28 +225,36 @@ class AtsScoringService:
             "grammar_indicators": {"score": 0, "max": 5, "passive_count": 0, "filler_count": 0, "total_bullets": 0},
             "date_consistency": {"score": 0, "max": 5, "consistent": True, "formats_found": [], "has_dates": False},
         }
-        max_score_check = sum(details["max"] for details in criteria_scores.values())
-        if max_score_check != 100: logger.warning(f"_calculate_criteria_scores: Max score adds up to {max_score_check}, not 100.")
+        # Bind each criterion's details dict once; the scoring below updates them in place
+        section_completeness = criteria_scores["section_completeness"]
+        contact_info_quality = criteria_scores["contact_info_quality"]
+        profile_summary_quality = criteria_scores["profile_summary_quality"]
+        keyword_density = criteria_scores["keyword_density"]
+        experience_details_present = criteria_scores["experience_details_present"]
+        action_verbs = criteria_scores["action_verbs"]
+        quantifiable_results = criteria_scores["quantifiable_results"]
+        bullet_conciseness = criteria_scores["bullet_conciseness"]
+        grammar_indicators = criteria_scores["grammar_indicators"]
+        date_consistency = criteria_scores["date_consistency"]
+        if __debug__:
+            max_score_check = sum(details["max"] for details in criteria_scores.values())
+            if max_score_check != 100: logger.warning(f"_calculate_criteria_scores: Max score adds up to {max_score_check}, not 100.")
 
         # --- Scoring Logic (Using CORRECTED keys: "Title Case" top-level, camelCase inner) ---
 
         # 1. Section Completeness (Using "Title Case" keys)
-        present_sections = []
-        sections_to_check = {
-            "Personal Data": "Personal Data", "Profile Summary": "Profile Summary",
-            "Experiences": "Experience", "Education": "Education", "Skills": "Skills",
-            "Projects": "Projects"
-        }
-        points_per_section = criteria_scores["section_completeness"]["max"] / len(sections_to_check) if sections_to_check and criteria_scores["section_completeness"]["max"] > 0 else 0
-        for data_key, display_name in sections_to_check.items():
-            content = processed_resume_data.get(data_key) # Use "Title Case" key
-            if content is not None:
-                is_present_and_non_empty = not isinstance(content, (list, dict)) or bool(content)
-                if is_present_and_non_empty:
-                    criteria_scores["section_completeness"]["score"] += points_per_section
-                    present_sections.append(display_name)
-        criteria_scores["section_completeness"]["passed"] = present_sections
-        criteria_scores["section_completeness"]["score"] = min(criteria_scores["section_completeness"]["score"], criteria_scores["section_completeness"]["max"])
+        sections_to_check = self.sections_to_check
+        points_per_section = section_completeness["max"] / len(sections_to_check) if section_completeness["max"] > 0 else 0
+        # A section counts when present and, for lists/dicts, non-empty (use "Title Case" keys)
+        present_sections = [
+            display_name for data_key, display_name in sections_to_check
+            if (content := processed_resume_data.get(data_key)) is not None
+            and (not isinstance(content, (list, dict)) or bool(content))
+        ]
+        # Equal points per section, so multiply once instead of accumulating floats
+        section_completeness["score"] = len(present_sections) * points_per_section
+        section_completeness["passed"] = present_sections
+        section_completeness["score"] = min(section_completeness["score"], section_completeness["max"])
 
         # 2. Contact Info Quality (Using "Title Case" key)
         contact_score = 0
@@ -181,16 +265,16 @@ class AtsScoringService:
             phone = personal_data.get("phone")
             linkedin = personal_data.get("linkedin")
             if email and isinstance(email, str) and self.email_pattern.match(email):
-                 contact_score += criteria_scores["contact_info_quality"]["max"] * 0.4
+                 contact_score += contact_info_quality["max"] * 0.4
                  contact_details_found.append("Email (Valid Format)")
             if phone and isinstance(phone, str) and self.phone_pattern.search(phone):
-                 contact_score += criteria_scores["contact_info_quality"]["max"] * 0.4
+                 contact_score += contact_info_quality["max"] * 0.4
                  contact_details_found.append("Phone (Found)")
             if linkedin and isinstance(linkedin, str) and 'linkedin.com' in linkedin.lower() and not linkedin.lower() == 'string':
-                 contact_score += criteria_scores["contact_info_quality"]["max"] * 0.2
+                 contact_score += contact_info_quality["max"] * 0.2
                  contact_details_found.append("LinkedIn (Found)")
-        criteria_scores["contact_info_quality"]["score"] = contact_score
-        criteria_scores["contact_info_quality"]["passed"] = contact_details_found
+        contact_info_quality["score"] = contact_score
+        contact_info_quality["passed"] = contact_details_found
 
         # 3. Profile Summary Quality (Using "Title Case" key)
         summary = processed_resume_data.get("Profile Summary") # Use "Title Case" key
@@ -199,72 +283,84 @@ class AtsScoringService:
             summary_present = True
             summary_words = summary.split()
             summary_length = len(summary_words)
-            if 25 <= summary_length <= 75: summary_score = criteria_scores["profile_summary_quality"]["max"]
-            elif 10 <= summary_length < 25 or 75 < summary_length <= 100: summary_score = criteria_scores["profile_summary_quality"]["max"] * 0.5
-        criteria_scores["profile_summary_quality"]["score"] = summary_score
-        criteria_scores["profile_summary_quality"]["present"] = summary_present
-        criteria_scores["profile_summary_quality"]["length"] = summary_length
+            if 25 <= summary_length <= 75: summary_score = profile_summary_quality["max"]
+            elif 10 <= summary_length < 25 or 75 < summary_length <= 100: summary_score = profile_summary_quality["max"] * 0.5
+        profile_summary_quality["score"] = summary_score
+        profile_summary_quality["present"] = summary_present
+        profile_summary_quality["length"] = summary_length
 
         # 4. Keyword Density (Using "Title Case" keys)
         extracted_keywords = processed_resume_data.get("Extracted Keywords", []) # Use "Title Case" key
         skills_list = processed_resume_data.get("Skills", []) # Use "Title Case" key
-        all_keywords = set(k for k in extracted_keywords if isinstance(k, str))
+        all_keywords = {k for k in extracted_keywords if isinstance(k, str)}
         if isinstance(skills_list, list):
-             for skill_entry in skills_list:
-                 skill_name = None
-                 if isinstance(skill_entry, dict):
-                      skill_name = skill_entry.get("skillName") or skill_entry.get("skill_name")
-                 if skill_name and isinstance(skill_name, str):
-                      all_keywords.add(skill_name)
+             skill_names = (skill_entry.get("skillName") or skill_entry.get("skill_name") for skill_entry in skills_list if isinstance(skill_entry, dict))
+             all_keywords.update(skill_name for skill_name in skill_names if skill_name and isinstance(skill_name, str))
         keyword_count = len(all_keywords)
         target_keywords = 30
         keyword_ratio = min(keyword_count / target_keywords, 1.0) if target_keywords > 0 else 0
-        criteria_scores["keyword_density"]["score"] = keyword_ratio * criteria_scores["keyword_density"]["max"]
-        criteria_scores["keyword_density"]["passed"] = keyword_count
-        criteria_scores["keyword_density"]["keywords_found"] = sorted(list(all_keywords))
+        keyword_density["score"] = keyword_ratio * keyword_density["max"]
+        keyword_density["passed"] = keyword_count
+        keyword_density["keywords_found"] = sorted(all_keywords)
 
         # 5-9. Experience/Project Analysis (Using "Title Case" keys)
         experiences = processed_resume_data.get("Experiences", []) # Use "Title Case" key
         projects = processed_resume_data.get("Projects", [])     # Use "Title Case" key
-        combined_entries = []
-        if isinstance(experiences, list): combined_entries.extend(experiences)
-        if isinstance(projects, list): combined_entries.extend(projects)
+        # Walk experiences then projects in place instead of copying them into one list
+        if not isinstance(experiences, list): experiences = ()
+        if not isinstance(projects, list): projects = ()
+        combined_entries = chain(experiences, projects)
 
-        criteria_scores["experience_details_present"]["total_entries"] = len(combined_entries)
-        total_bullets = 0; entries_with_desc = 0; bullets_with_action_verbs = 0; bullets_with_numbers = 0; concise_bullets = 0; passive_voice_count = 0; filler_word_count = 0; date_strings = []
+        total_entries = len(experiences) + len(projects); entries_with_desc = 0; bullets_with_action_verbs = 0; bullets_with_numbers = 0; concise_bullets = 0; passive_voice_count = 0; filler_word_count = 0; date_strings = []
         max_bullet_len_chars = 170
 
+        # Pass 1: per-entry bookkeeping, and normalize every description into one flat bullet list
+        bullets: List[str] = []
         for entry in combined_entries:
             if not isinstance(entry, dict): continue
             descriptions_raw = entry.get("description") # Use camelCase
             descriptions = []
-            if isinstance(descriptions_raw, str): descriptions = [s.strip() for s in descriptions_raw.split('\n') if s.strip()]
+            if isinstance(descriptions_raw, str): descriptions = [line for raw_line in descriptions_raw.split('\n') if (line := raw_line.strip())]
             elif isinstance(descriptions_raw, list): descriptions = [d for d in descriptions_raw if isinstance(d, str) and d.strip()]
 
-            entry_has_desc = bool(descriptions)
-            if entry_has_desc:
+            if descriptions:
                  entries_with_desc += 1
                  entry_name = entry.get("jobTitle") or entry.get("projectName", "Entry") # Use camelCase
-                 criteria_scores["experience_details_present"]["passed"].append(entry_name)
-                 for desc in descriptions:
-                     total_bullets += 1; desc_clean = desc; desc_words = desc_clean.split(" ")
-                     first_word = desc_words[0].lower().rstrip('.,:') if desc_words else ""
-                     is_action_verb = False
-                     if first_word in self.action_verbs_set: is_action_verb = True
-                     elif (first_word in self.common_adverbs or (first_word.endswith('ly') and len(first_word)>3)) and len(desc_words) > 1:
-                         second_word = desc_words[1].lower().rstrip('.,:')
-                         if second_word in self.action_verbs_set: is_action_verb = True
-                     if is_action_verb: bullets_with_action_verbs += 1
-                     if self.number_pattern.search(desc_clean): bullets_with_numbers += 1
-                     if len(desc_clean) <= max_bullet_len_chars: concise_bullets += 1
-                     if self.passive_voice_pattern.search(desc_clean): passive_voice_count += 1
-                     if self.filler_words_pattern.search(desc_clean): filler_word_count += 1
+                 experience_details_present["passed"].append(entry_name)
+                 bullets.extend(descriptions)
 
             start_date = entry.get("startDate") # Use camelCase
             end_date = entry.get("endDate")     # Use camelCase
             if isinstance(start_date, str) and start_date.strip(): date_strings.append(start_date.strip())
             if isinstance(end_date, str) and end_date.strip(): date_strings.append(end_date.strip())
 
+        # Pass 2: the per-bullet checks, as one tight loop. Bind the lookups once first
+        total_bullets = len(bullets)
+        action_verbs_set = self.action_verbs_set
+        common_adverbs = self.common_adverbs
+        digit_search = self.digit_pattern.search
+        passive_search = self.passive_voice_pattern.search; passive_search_ascii = self.passive_voice_pattern_ascii.search
+        filler_search = self.filler_words_pattern.search; filler_search_ascii = self.filler_words_pattern_ascii.search
+        for desc_clean in bullets:
+            # Lowercase once for every case-insensitive check below. Only the first word
+            # (and the second, after an adverb) matters for the action-verb check, so
+            # peel words off with partition instead of splitting
+            desc_lower = desc_clean.lower()
+            first_raw, has_more, rest = desc_lower.partition(" ")
+            first_word = first_raw.rstrip('.,:')
+            is_action_verb = False
+            if first_word in action_verbs_set: is_action_verb = True
+            elif (first_word in common_adverbs or (first_word.endswith('ly') and len(first_word)>3)) and has_more:
+                second_word = rest.partition(" ")[0].rstrip('.,:')
+                if second_word in action_verbs_set: is_action_verb = True
+            if is_action_verb: bullets_with_action_verbs += 1
+            if digit_search(desc_clean): bullets_with_numbers += 1
+            if len(desc_clean) <= max_bullet_len_chars: concise_bullets += 1
+            if desc_lower.isascii(): desc_scan = desc_lower.encode('ascii'); bullet_passive, bullet_filler = passive_search_ascii, filler_search_ascii
+            else: desc_scan = desc_lower; bullet_passive, bullet_filler = passive_search, filler_search
+            if bullet_passive(desc_scan): passive_voice_count += 1
+            if bullet_filler(desc_scan): filler_word_count += 1
+
         # Collect Education dates
         edu_entries = processed_resume_data.get("Education", []) # Use "Title Case" key
         if isinstance(edu_entries, list):
@@ -276,55 +372,58 @@ class AtsScoringService:
                  if isinstance(end_date, str) and end_date.strip(): date_strings.append(end_date.strip())
 
         # --- Update criteria_scores based on counts ---
-        criteria_scores["experience_details_present"]["score"] = (entries_with_desc / len(combined_entries) if combined_entries else 0) * criteria_scores["experience_details_present"]["max"]
-        criteria_scores["action_verbs"]["total_bullets"] = total_bullets
-        criteria_scores["quantifiable_results"]["total_bullets"] = total_bullets
-        criteria_scores["bullet_conciseness"]["total_bullets"] = total_bullets
-        criteria_scores["grammar_indicators"]["total_bullets"] = total_bullets
+        experience_details_present["total_entries"] = total_entries
+        experience_details_present["score"] = (entries_with_desc / total_entries if total_entries else 0) * experience_details_present["max"]
+        action_verbs["total_bullets"] = total_bullets
+        quantifiable_results["total_bullets"] = total_bullets
+        bullet_conciseness["total_bullets"] = total_bullets
+        grammar_indicators["total_bullets"] = total_bullets
         if total_bullets > 0:
-            criteria_scores["action_verbs"]["passed"] = bullets_with_action_verbs
-            criteria_scores["action_verbs"]["score"] = min(bullets_with_action_verbs / total_bullets / 0.8, 1.0) * criteria_scores["action_verbs"]["max"]
-            criteria_scores["quantifiable_results"]["passed"] = bullets_with_numbers
-            criteria_scores["quantifiable_results"]["score"] = min(bullets_with_numbers / total_bullets / 0.35, 1.0) * criteria_scores["quantifiable_results"]["max"]
-            criteria_scores["bullet_conciseness"]["passed"] = concise_bullets
-            criteria_scores["bullet_conciseness"]["score"] = min(concise_bullets / total_bullets / 0.85, 1.0) * criteria_scores["bullet_conciseness"]["max"]
-            grammar_max = criteria_scores["grammar_indicators"]["max"]
+            action_verbs["passed"] = bullets_with_action_verbs
+            action_verbs["score"] = min(bullets_with_action_verbs / total_bullets / 0.8, 1.0) * action_verbs["max"]
+            quantifiable_results["passed"] = bullets_with_numbers
+            quantifiable_results["score"] = min(bullets_with_numbers / total_bullets / 0.35, 1.0) * quantifiable_results["max"]
+            bullet_conciseness["passed"] = concise_bullets
+            bullet_conciseness["score"] = min(concise_bullets / total_bullets / 0.85, 1.0) * bullet_conciseness["max"]
+            grammar_max = grammar_indicators["max"]
             passive_penalty_ratio = passive_voice_count / total_bullets
             filler_penalty_ratio = filler_word_count / total_bullets
             grammar_score = max(0, grammar_max - (passive_penalty_ratio * grammar_max * 1.5) - (filler_penalty_ratio * grammar_max * 0.75))
-            criteria_scores["grammar_indicators"]["score"] = grammar_score
-            criteria_scores["grammar_indicators"]["passive_count"] = passive_voice_count
-            criteria_scores["grammar_indicators"]["filler_count"] = filler_word_count
+            grammar_indicators["score"] = grammar_score
+            grammar_indicators["passive_count"] = passive_voice_count
+            grammar_indicators["filler_count"] = filler_word_count
 
         # Date Consistency
-        criteria_scores["date_consistency"]["has_dates"] = bool(date_strings)
-        date_formats_found = [d for d in date_strings if self.date_format_pattern.match(d)]
-        consistent_dates = True; most_common_format_display = "N/A"
-        if len(date_formats_found) >= 1:
-            format_categories = []
-            for d in date_formats_found:
-                 d_upper = d.upper()
-                 if d_upper == "PRESENT": format_categories.append("PRESENT")
-                 elif re.match(r"^\d{4}-\d{2}-\d{2}$", d): format_categories.append("YYYY-MM-DD")
-                 elif re.match(r"^\d{4}-\d{2}$", d): format_categories.append("YYYY-MM")
-                 elif re.match(r"^\d{2}/\d{4}$", d): format_categories.append("MM/YYYY")
-                 elif re.match(r"^\w+\s+\d{4}$", d): format_categories.append("Month YYYY")
-                 else: format_categories.append("Unknown")
-            format_counts = Counter(cat for cat in format_categories if cat != 'Unknown')
-            if format_counts:
-                 valid_format_types = set(format_counts.keys()) - {'PRESENT'}
-                 if len(valid_format_types) > 1: consistent_dates = False
-                 most_common_format_display = format_counts.most_common(1)[0][0]
-        elif date_strings:
+        date_consistency["has_dates"] = bool(date_strings)
+        # One match per date both filters and categorizes it. Only distinct strings matter
+        # (consistency looks at which categories occur), so accepted dates go into a set.
+        date_formats_found = set(); consistent_dates = True
+        date_match = self.date_format_pattern.match
+        seen_slots = set() # Categories that occur, by group index
+        for d in date_strings:
+            if d in date_formats_found: continue
+            m = date_match(d)
+            if m is None: continue
+            date_formats_found.add(d)
+            if m.lastindex is not None: seen_slots.add(m.lastindex) # None: accepted, but unknown category
+        if seen_slots:
+             valid_format_types = len(seen_slots - {PRESENT_SLOT})
+             if valid_format_types > 1: consistent_dates = False
+        elif date_strings and not date_formats_found:
              consistent_dates = False
-        if consistent_dates and date_formats_found: criteria_scores["date_consistency"]["score"] = criteria_scores["date_consistency"]["max"]
-        elif not date_strings: criteria_scores["date_consistency"]["score"] = criteria_scores["date_consistency"]["max"] * 0.5; consistent_dates = True
-        else: criteria_scores["date_consistency"]["score"] = 0; consistent_dates = False
-        criteria_scores["date_consistency"]["consistent"] = consistent_dates
-        criteria_scores["date_consistency"]["formats_found"] = list(set(date_formats_found)) # Store matched formats only
+        if consistent_dates and date_formats_found: date_consistency["score"] = date_consistency["max"]
+        elif not date_strings: date_consistency["score"] = date_consistency["max"] * 0.5; consistent_dates = True
+        else: date_consistency["score"] = 0; consistent_dates = False
+        date_consistency["consistent"] = consistent_dates
+        date_consistency["formats_found"] = list(date_formats_found) # Store matched formats only
 
 
-        logger.debug(f"Calculated criteria scores (using corrected keys): {json.dumps(criteria_scores, indent=2)}")
+        # Each criterion's percentage is final now; store it once for the report builder
+        for details in criteria_scores.values():
+            details["percentage"] = calculate_percentage(details["score"], details["max"])
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calculated criteria scores (using corrected keys): %s", json.dumps(criteria_scores, indent=2))
         return criteria_scores
 
 
@@ -332,22 +431,6 @@ class AtsScoringService:
     def _structure_frontend_response(self, final_score: int, criteria_scores: Dict, suggestions: Dict[str, List[str]]) -> Dict[str, Any]:
         """Takes raw scores and suggestions, returns structured dict for frontend UI."""
 
-        # --- Helper to calculate percentage and status/color ---
-        def get_status_color_perc(score: Optional[float], max_score: Optional[float]) -> Tuple[int | None, str, str]:
-            if score is None or max_score is None or max_score == 0:
-                return None, "Info", "default"
-            percentage = math.ceil(min(max(score / max_score, 0), 1) * 100)
-            if percentage >= THRESHOLD_GOOD: return percentage, "Strong", "success"
-            if percentage >= THRESHOLD_MEDIUM: return percentage, "Okay", "warning"
-            return percentage, "Needs Improvement", "error"
-
-        # Helper to calculate percentage only
-        def calculate_percentage(score: Optional[float], max_score: Optional[float]) -> int | None:
-            if score is None or max_score is None or max_score == 0:
-                return None
-            percentage = math.ceil(min(max(score / max_score, 0), 1) * 100)
-            return percentage
-
         # --- Build Sidebar Data ---
         sidebar_categories = []
         total_issues_count = 0
@@ -359,20 +442,22 @@ class AtsScoringService:
         content_sub_items.append({"text": "ATS Parse Rate", "status": "pass"})
         qr_item = criteria_scores.get("quantifiable_results")
         if qr_item:
-            qr_perc = calculate_percentage(qr_item.get("score"), qr_item.get("max"))
+            qr_perc = qr_item.get("percentage")
             qr_status = "pass" if qr_perc is not None and qr_perc >= THRESHOLD_MEDIUM else "fail"
             content_sub_items.append({"text": "Quantifying Impact", "status": qr_status})
-            if qr_item.get("max", 0) > 0:
-                 content_scores_sum += qr_item.get("score", 0); content_max_sum += qr_item.get("max", 0)
+            qr_score, qr_max = score_and_max(qr_item)
+            if qr_max > 0:
+                 content_scores_sum += qr_score; content_max_sum += qr_max
             if qr_status == "fail": total_issues_count += 1
         content_sub_items.append({"text": "Repetition", "status": "info"}) # No check for this yet
         gi_item = criteria_scores.get("grammar_indicators")
         if gi_item:
-             gi_perc = calculate_percentage(gi_item.get("score"), gi_item.get("max"))
+             gi_perc = gi_item.get("percentage")
              gi_status = "pass" if gi_perc is not None and gi_perc >= THRESHOLD_GOOD else "fail"
              content_sub_items.append({"text": "Spelling & Grammar", "status": gi_status})
-             if gi_item.get("max", 0) > 0:
-                  content_scores_sum += gi_item.get("score", 0); content_max_sum += gi_item.get("max", 0)
+             gi_score, gi_max = score_and_max(gi_item)
+             if gi_max > 0:
+                  content_scores_sum += gi_score; content_max_sum += gi_max
              if gi_status == "fail": total_issues_count += 1
         content_percentage = calculate_percentage(content_scores_sum, content_max_sum)
         sidebar_categories.append({"title": "CONTENT", "percentage": content_percentage, "sub_items": content_sub_items})
@@ -381,19 +466,21 @@ class AtsScoringService:
         section_sub_items = []; section_scores_sum = 0; section_max_sum = 0
         es_item = criteria_scores.get("section_completeness")
         if es_item:
-            es_perc = calculate_percentage(es_item.get("score"), es_item.get("max"))
+            es_perc = es_item.get("percentage")
             es_status = "pass" if es_perc is not None and es_perc >= 90 else "fail"
             section_sub_items.append({"text": "Essential Sections", "status": es_status})
-            if es_item.get("max", 0) > 0:
-                 section_scores_sum += es_item.get("score", 0); section_max_sum += es_item.get("max", 0)
+            es_score, es_max = score_and_max(es_item)
+            if es_max > 0:
+                 section_scores_sum += es_score; section_max_sum += es_max
             if es_status == "fail": total_issues_count += 1
         ci_item = criteria_scores.get("contact_info_quality")
         if ci_item:
-            ci_perc = calculate_percentage(ci_item.get("score"), ci_item.get("max"))
+            ci_perc = ci_item.get("percentage")
             ci_status = "pass" if ci_perc is not None and ci_perc >= 80 else "fail"
             section_sub_items.append({"text": "Contact Information", "status": ci_status})
-            if ci_item.get("max", 0) > 0:
-                 section_scores_sum += ci_item.get("score", 0); section_max_sum += ci_item.get("max", 0)
+            ci_score, ci_max = score_and_max(ci_item)
+            if ci_max > 0:
+                 section_scores_sum += ci_score; section_max_sum += ci_max
             if ci_status == "fail": total_issues_count += 1
         section_percentage = calculate_percentage(section_scores_sum, section_max_sum)
         sidebar_categories.append({"title": "SECTION", "percentage": section_percentage, "sub_items": section_sub_items})
@@ -402,7 +489,6 @@ class AtsScoringService:
         ats_sub_items = []; ats_pass_count = 0; ats_total_checkable = 0
         ats_sub_items.append({"text": "File Format & Size", "status": "pass"}) # Assumed pass
         ats_sub_items.append({"text": "Design", "status": "info"}) # No check for this
-        ci_item = criteria_scores.get("contact_info_quality") # Reuse
         email_status = "fail"; ats_total_checkable += 1
         if ci_item and "Email (Valid Format)" in ci_item.get("passed", []):
             email_status = "pass"; ats_pass_count += 1
@@ -438,7 +524,7 @@ class AtsScoringService:
         # --- Card 1: Summary ---
         try:
              summary_item = criteria_scores.get("profile_summary_quality", {})
-             summary_perc, summary_status, summary_color = get_status_color_perc(summary_item.get("score"), summary_item.get("max"))
+             summary_perc, summary_status, summary_color = get_status_color_perc(summary_item.get("percentage"))
              summary_points = []
              if summary_item.get("present", False):
                  summary_points.append({"text": "Summary is present.", "isGood": True})
@@ -465,9 +551,10 @@ class AtsScoringService:
             exp_details_item = criteria_scores.get("experience_details_present", {})
             
             # Combine scores for overall status
-            exp_score = av_item.get("score", 0) + qr_item.get("score", 0) + exp_details_item.get("score", 0)
-            exp_max = av_item.get("max", 0) + qr_item.get("max", 0) + exp_details_item.get("max", 0)
-            exp_perc, exp_status, exp_color = get_status_color_perc(exp_score, exp_max)
+            av_score, av_max = score_and_max(av_item); qr_score, qr_max = score_and_max(qr_item); exp_details_score, exp_details_max = score_and_max(exp_details_item)
+            exp_score = av_score + qr_score + exp_details_score
+            exp_max = av_max + qr_max + exp_details_max
+            exp_perc, exp_status, exp_color = get_status_color_perc(calculate_percentage(exp_score, exp_max))
 
             exp_points = []
             # Check for descriptions
@@ -479,13 +566,13 @@ class AtsScoringService:
                      "isGood": desc_entries_count == exp_entries_count
                  })
             # Check action verbs
-            av_perc = calculate_percentage(av_item.get("score"), av_item.get("max"))
+            av_perc = av_item.get("percentage")
             exp_points.append({
                  "text": "Uses strong action verbs to start bullet points.",
                  "isGood": av_perc is not None and av_perc >= THRESHOLD_MEDIUM
             })
             # Check quantifying impact
-            qr_perc = calculate_percentage(qr_item.get("score"), qr_item.get("max"))
+            qr_perc = qr_item.get("percentage")
             exp_points.append({
                  "text": "Includes quantifiable achievements (numbers, $, %).",
                  "isGood": qr_perc is not None and qr_perc >= THRESHOLD_MEDIUM
@@ -502,7 +589,7 @@ class AtsScoringService:
         # --- Card 3: Skills ---
         try:
             kw_item = criteria_scores.get("keyword_density", {})
-            kw_perc, kw_status, kw_color = get_status_color_perc(kw_item.get("score"), kw_item.get("max"))
+            kw_perc, kw_status, kw_color = get_status_color_perc(kw_item.get("percentage"))
             kw_points = []
             kw_count = kw_item.get("passed", 0)
             if kw_count >= 15:
@@ -526,17 +613,18 @@ class AtsScoringService:
             gi_item = criteria_scores.get("grammar_indicators", {})
             dc_item = criteria_scores.get("date_consistency", {})
 
-            style_score = bc_item.get("score", 0) + gi_item.get("score", 0) + dc_item.get("score", 0)
-            style_max = bc_item.get("max", 0) + gi_item.get("max", 0) + dc_item.get("max", 0)
-            style_perc, style_status, style_color = get_status_color_perc(style_score, style_max)
+            bc_score, bc_max = score_and_max(bc_item); gi_score, gi_max = score_and_max(gi_item); dc_score, dc_max = score_and_max(dc_item)
+            style_score = bc_score + gi_score + dc_score
+            style_max = bc_max + gi_max + dc_max
+            style_perc, style_status, style_color = get_status_color_perc(calculate_percentage(style_score, style_max))
 
             style_points = []
-            bc_perc = calculate_percentage(bc_item.get("score"), bc_item.get("max"))
+            bc_perc = bc_item.get("percentage")
             style_points.append({
                  "text": "Bullet points are concise and easy to read.",
                  "isGood": bc_perc is not None and bc_perc >= THRESHOLD_GOOD
             })
-            gi_perc = calculate_percentage(gi_item.get("score"), gi_item.get("max"))
+            gi_perc = gi_item.get("percentage")
             style_points.append({
                  "text": "Uses active voice and strong phrasing.",
                  "isGood": gi_perc is not None and gi_perc >= THRESHOLD_GOOD
@@ -572,137 +660,140 @@ class AtsScoringService:
             "Profile Summary": [], "Keywords": [], "Experience & Projects": [],
             "Grammar & Style": [], "Education": []
         }
+        # Bind each category's list once; the dict keeps the category order for the result
+        overall_sugg, structure_sugg, contact_sugg, summary_sugg, keywords_sugg, \
+            experience_sugg, style_sugg, education_sugg = suggestions.values()
         score_threshold_good = 85
         score_threshold_medium = 65
         
         # --- Populate Suggestions (using corrected keys) ---
         
         # Structure & Sections
-        completeness_max = criteria_scores.get("section_completeness", {}).get("max", 15)
-        passed_sections_list = criteria_scores.get("section_completeness", {}).get("passed", [])
-        if criteria_scores.get("section_completeness", {}).get("score", 0) < completeness_max - 0.1: # Added tolerance
-             missing = []
+        section_completeness = criteria_scores.get("section_completeness", {})
+        completeness_max = section_completeness.get("max", 15)
+        passed_sections_list = section_completeness.get("passed", [])
+        if section_completeness.get("score", 0) < completeness_max - 0.1: # Added tolerance
              # Check display names
-             if "Personal Data" not in passed_sections_list: missing.append("Contact Info")
-             if "Experience" not in passed_sections_list: missing.append("Work Experience/Projects")
-             if "Education" not in passed_sections_list: missing.append("Education")
-             if "Skills" not in passed_sections_list: missing.append("Skills")
-             if "Projects" not in passed_sections_list: missing.append("Projects") # Check for projects
+             missing = [shown for name, shown in self.missing_section_hints if name not in passed_sections_list]
              if missing:
-                 suggestions["Structure & Sections"].append(f"Missing or unclear standard sections: {', '.join(missing)}. Use clear headers.")
+                 structure_sugg.append(f"Missing or unclear standard sections: {', '.join(missing)}. Use clear headers.")
 
         # Contact Info
-        contact_score = criteria_scores.get("contact_info_quality", {}).get("score", 0)
-        contact_max = criteria_scores.get("contact_info_quality", {}).get("max", 10)
-        contact_passed = criteria_scores.get("contact_info_quality", {}).get("passed", [])
+        contact_info_quality = criteria_scores.get("contact_info_quality", {})
+        contact_score = contact_info_quality.get("score", 0)
+        contact_max = contact_info_quality.get("max", 10)
+        contact_passed = contact_info_quality.get("passed", [])
         if contact_score < contact_max * 0.8:
-             missing_contact = []
-             if "Email (Valid Format)" not in contact_passed: missing_contact.append("valid Email")
-             if "Phone (Found)" not in contact_passed: missing_contact.append("Phone Number")
+             missing_contact = [shown for name, shown in self.missing_contact_hints if name not in contact_passed]
              if missing_contact:
-                 suggestions["Contact Info"].append(f"Include essential, correctly formatted details: {', '.join(missing_contact)}.")
+                 contact_sugg.append(f"Include essential, correctly formatted details: {', '.join(missing_contact)}.")
         if "LinkedIn (Found)" not in contact_passed:
-             suggestions["Contact Info"].append("Consider adding a professional LinkedIn profile link.")
+             contact_sugg.append("Consider adding a professional LinkedIn profile link.")
 
         # Profile Summary
-        summary_score = criteria_scores.get("profile_summary_quality", {}).get("score", 0)
-        summary_max = criteria_scores.get("profile_summary_quality", {}).get("max", 5)
-        summary_present = criteria_scores.get("profile_summary_quality", {}).get("present", False)
-        summary_length = criteria_scores.get("profile_summary_quality", {}).get("length", 0)
+        profile_summary_quality = criteria_scores.get("profile_summary_quality", {})
+        summary_score = profile_summary_quality.get("score", 0)
+        summary_max = profile_summary_quality.get("max", 5)
+        summary_present = profile_summary_quality.get("present", False)
+        summary_length = profile_summary_quality.get("length", 0)
         if not summary_present:
              if "Profile Summary" not in passed_sections_list: # Check display name
-                 suggestions["Structure & Sections"].append("Consider adding a Profile Summary/Objective section near the top.")
+                 structure_sugg.append("Consider adding a Profile Summary/Objective section near the top.")
              else:
-                 suggestions["Profile Summary"].append("Add a brief Profile Summary (2-4 sentences) to highlight key qualifications.")
+                 summary_sugg.append("Add a brief Profile Summary (2-4 sentences) to highlight key qualifications.")
         elif summary_score < summary_max:
              if summary_length < 25:
-                 suggestions["Profile Summary"].append("Expand your summary slightly (aim for 2-4 sentences) to better introduce key skills.")
+                 summary_sugg.append("Expand your summary slightly (aim for 2-4 sentences) to better introduce key skills.")
              elif summary_length > 75:
-                 suggestions["Profile Summary"].append("Condense your summary to 2-4 concise sentences focusing on strongest qualifications.")
+                 summary_sugg.append("Condense your summary to 2-4 concise sentences focusing on strongest qualifications.")
 
         # Keywords
-        kw_score = criteria_scores.get("keyword_density", {}).get("score", 0)
-        kw_max = criteria_scores.get("keyword_density", {}).get("max", 15)
-        kw_count = criteria_scores.get("keyword_density", {}).get("passed", 0)
+        keyword_density = criteria_scores.get("keyword_density", {})
+        kw_score = keyword_density.get("score", 0)
+        kw_max = keyword_density.get("max", 15)
+        kw_count = keyword_density.get("passed", 0)
         if kw_count < 10:
-            suggestions["Keywords"].append("Keyword count is low. Ensure technical skills, tools, software, industry terms are clearly listed/described.")
+            keywords_sugg.append("Keyword count is low. Ensure technical skills, tools, software, industry terms are clearly listed/described.")
         elif kw_score < kw_max * 0.7:
-            suggestions["Keywords"].append(f"Keyword usage ({kw_count} found) could be improved. Integrate more relevant terms naturally into Summary and Experience.")
+            keywords_sugg.append(f"Keyword usage ({kw_count} found) could be improved. Integrate more relevant terms naturally into Summary and Experience.")
 
         # Experience & Projects
-        exp_score = criteria_scores.get("experience_details_present", {}).get("score", 0)
-        exp_max = criteria_scores.get("experience_details_present", {}).get("max", 10)
+        experience_details_present = criteria_scores.get("experience_details_present", {})
+        exp_score = experience_details_present.get("score", 0)
+        exp_max = experience_details_present.get("max", 10)
         if exp_score < exp_max - 0.1:
-             suggestions["Experience & Projects"].append("Ensure every work/project entry includes descriptive bullet points.")
+             experience_sugg.append("Ensure every work/project entry includes descriptive bullet points.")
 
         # Action Verbs (Experience & Projects)
-        av_score = criteria_scores.get("action_verbs", {}).get("score", 0)
-        av_max = criteria_scores.get("action_verbs", {}).get("max", 15)
-        av_passed = criteria_scores.get("action_verbs", {}).get("passed", 0)
-        av_total = criteria_scores.get("action_verbs", {}).get("total_bullets", 0)
+        action_verbs = criteria_scores.get("action_verbs", {})
+        av_score = action_verbs.get("score", 0)
+        av_max = action_verbs.get("max", 15)
+        av_passed = action_verbs.get("passed", 0)
+        av_total = action_verbs.get("total_bullets", 0)
         if av_total > 0 and av_score < av_max * 0.7:
-             suggestions["Experience & Projects"].append(f"Use strong action verbs (e.g., Managed, Developed) to start most ({max(1, int(av_total*0.8) - av_passed)} more) bullet points.")
+             experience_sugg.append(f"Use strong action verbs (e.g., Managed, Developed) to start most ({max(1, int(av_total*0.8) - av_passed)} more) bullet points.")
 
         # Quantifiable Results (Experience & Projects)
-        qr_score = criteria_scores.get("quantifiable_results", {}).get("score", 0)
-        qr_max = criteria_scores.get("quantifiable_results", {}).get("max", 15)
-        qr_passed = criteria_scores.get("quantifiable_results", {}).get("passed", 0)
-        qr_total = criteria_scores.get("quantifiable_results", {}).get("total_bullets", 0)
+        quantifiable_results = criteria_scores.get("quantifiable_results", {})
+        qr_score = quantifiable_results.get("score", 0)
+        qr_max = quantifiable_results.get("max", 15)
+        qr_passed = quantifiable_results.get("passed", 0)
+        qr_total = quantifiable_results.get("total_bullets", 0)
         target_quant_bullets = max(1, int(qr_total * 0.35))
         if qr_total > 0 and qr_score < qr_max * 0.6:
-             suggestions["Experience & Projects"].append(f"Quantify achievements more. Add numbers/metrics to showcase impact (aim for ~{target_quant_bullets} bullets).")
+             experience_sugg.append(f"Quantify achievements more. Add numbers/metrics to showcase impact (aim for ~{target_quant_bullets} bullets).")
 
         # Grammar & Style
-        bc_score = criteria_scores.get("bullet_conciseness", {}).get("score", 0)
-        bc_max = criteria_scores.get("bullet_conciseness", {}).get("max", 10)
-        bc_total = criteria_scores.get("bullet_conciseness", {}).get("total_bullets", 0)
+        bullet_conciseness = criteria_scores.get("bullet_conciseness", {})
+        bc_score = bullet_conciseness.get("score", 0)
+        bc_max = bullet_conciseness.get("max", 10)
+        bc_total = bullet_conciseness.get("total_bullets", 0)
         if bc_total > 0 and bc_score < bc_max * 0.8:
-            suggestions["Grammar & Style"].append("Keep bullet points concise (ideally 1-2 lines, under 170 characters) for easy scanning.")
+            style_sugg.append("Keep bullet points concise (ideally 1-2 lines, under 170 characters) for easy scanning.")
 
-        grammar_score = criteria_scores.get("grammar_indicators", {}).get("score", 0)
-        grammar_max = criteria_scores.get("grammar_indicators", {}).get("max", 5)
-        passive_count = criteria_scores.get("grammar_indicators", {}).get("passive_count", 0)
-        filler_count = criteria_scores.get("grammar_indicators", {}).get("filler_count", 0)
+        grammar_indicators = criteria_scores.get("grammar_indicators", {})
+        grammar_score = grammar_indicators.get("score", 0)
+        grammar_max = grammar_indicators.get("max", 5)
+        passive_count = grammar_indicators.get("passive_count", 0)
+        filler_count = grammar_indicators.get("filler_count", 0)
         if grammar_score < grammar_max * 0.8 or passive_count > 0 or filler_count > 0:
             if passive_count > 0:
-                 suggestions["Grammar & Style"].append(f"Avoid passive voice ({passive_count} instance(s) found). Rephrase actively (e.g., 'Managed team' instead of 'Team was managed').")
+                 style_sugg.append(f"Avoid passive voice ({passive_count} instance(s) found). Rephrase actively (e.g., 'Managed team' instead of 'Team was managed').")
             if filler_count > 0:
-                 suggestions["Grammar & Style"].append(f"Replace weaker phrases like 'responsible for' or 'assisted with' ({filler_count} instance(s) found) with direct action verbs describing your contribution.")
+                 style_sugg.append(f"Replace weaker phrases like 'responsible for' or 'assisted with' ({filler_count} instance(s) found) with direct action verbs describing your contribution.")
 
-        if not criteria_scores.get("date_consistency", {}).get("consistent", True):
-             formats = criteria_scores.get("date_consistency", {}).get("formats_found", [])
+        date_consistency = criteria_scores.get("date_consistency", {})
+        if not date_consistency.get("consistent", True):
+             formats = date_consistency.get("formats_found", [])
              suggestion_text = "Use a consistent date format (e.g., MM/YYYY or Month YYYY) throughout all sections (Experience, Education)."
              if formats:
                  valid_formats = [f for f in formats if self.date_format_pattern.match(f)]
                  unique_valid = sorted(list(set(valid_formats)))
                  suggestion_text += f" Found formats like: {', '.join(unique_valid[:3])}{'...' if len(unique_valid) > 3 else ''}."
-             suggestions["Grammar & Style"].append(suggestion_text)
+             style_sugg.append(suggestion_text)
 
         # Education Section
         education_entries = processed_resume_data.get("Education", []) # Use correct key
-        missing_edu_details = False
-        if isinstance(education_entries, list):
-             for edu in education_entries:
-                 if isinstance(edu, dict):
-                     if not edu.get("institution") or not edu.get("degree"):
-                         missing_edu_details = True; break
-        if missing_edu_details:
-             suggestions["Education"].append("Ensure all education entries include both the institution name and the degree/qualification obtained.")
+        if isinstance(education_entries, list) and any(
+            isinstance(edu, dict) and (not edu.get("institution") or not edu.get("degree"))
+            for edu in education_entries
+        ):
+             education_sugg.append("Ensure all education entries include both the institution name and the degree/qualification obtained.")
 
         # Overall Feedback
         has_specific_suggestions = any(len(sug_list) > 0 for cat, sug_list in suggestions.items() if cat != "Overall")
         if final_score < score_threshold_medium :
-             suggestions["Overall"].append("This resume needs significant improvement for ATS compatibility. Focus on the suggestions provided in each category.")
+             overall_sugg.append("This resume needs significant improvement for ATS compatibility. Focus on the suggestions provided in each category.")
         elif final_score < score_threshold_good:
              if has_specific_suggestions:
-                 suggestions["Overall"].append("Good start! This resume is reasonably ATS-friendly. Addressing the specific suggestions can make it much stronger.")
+                 overall_sugg.append("Good start! This resume is reasonably ATS-friendly. Addressing the specific suggestions can make it much stronger.")
              else:
-                 suggestions["Overall"].append("Good structure and content! Generally ATS-friendly. Minor refinements could improve it further.")
+                 overall_sugg.append("Good structure and content! Generally ATS-friendly. Minor refinements could improve it further.")
         else:
              if has_specific_suggestions:
-                 suggestions["Overall"].append("Excellent score! Your resume aligns well with ATS best practices. Addressing the minor suggestions below will perfect it.")
+                 overall_sugg.append("Excellent score! Your resume aligns well with ATS best practices. Addressing the minor suggestions below will perfect it.")
              else:
-                 suggestions["Overall"].append("Excellent! Your resume follows ATS best practices effectively.")
+                 overall_sugg.append("Excellent! Your resume follows ATS best practices effectively.")
 
         final_suggestions = {cat: sug_list for cat, sug_list in suggestions.items() if sug_list}
         return final_suggestions
\ No newline at end of file
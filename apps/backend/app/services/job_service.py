@@ -121,10 +121,11 @@ class JobService:
         """
         prompt_template = prompt_factory.get("structured_job")
         prompt = prompt_template.format(
-            json.dumps(json_schema_factory.get("structured_job"), indent=2),
+            json_schema_factory.get_serialized("structured_job"),
             job_description_text,
         )
-        logger.info(f"Structured Job Prompt: {prompt}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Structured Job Prompt: %s", prompt)
         raw_output = await self.json_agent_manager.run(prompt=prompt)
 
         try:
@@ -1,25 +1,123 @@
 # File: apps/backend/app/services/resume_service.py
 
 import os
+import re
+import hashlib
+import shutil
 import uuid
-import json
+import orjson
+import asyncio
 import tempfile
 import logging
+from functools import lru_cache
 
 from markitdown import MarkItDown
+from fastapi.concurrency import run_in_threadpool
 # Removed SQLAlchemy imports
 from pydantic import ValidationError
-from typing import Dict, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
 # Removed Model imports
 from app.agent import AgentManager
+from app.core import settings
 from app.prompt import prompt_factory
 from app.schemas.json import json_schema_factory
 from app.schemas.pydantic import StructuredResumeModel
 from .exceptions import ResumeValidationError # Keep validation error
+from .cache import ResponseCache
 from json_repair import repair_json
 logger = logging.getLogger(__name__)
 
+# Caps in-flight extraction calls per worker: one upload fans out into a call per
+# section, so without a limit a few concurrent uploads could trip provider rate
+# limits. asyncio primitives bind to the running loop on first use.
+_EXTRACTION_SEM = asyncio.Semaphore(settings.RESUME_EXTRACTION_MAX_CONCURRENCY)
+
+# Section headers recognized in converted resume text, by the schema key they fill.
+# Only standalone heading lines count: a markdown heading, a fully bold line, or an
+# all-caps line, with at most a bare trailing ":". Lines with inline content (e.g.
+# "Skills: Python" or "Project: Checkout revamp" inside a job) never start a section.
+SECTION_TITLES = {
+    "Profile Summary": ("summary", "professional summary", "profile", "objective", "about me"),
+    "Experiences": ("experience", "work experience", "professional experience", "employment", "employment history", "work history"),
+    "Education": ("education",),
+    "Skills": ("skills", "technical skills"),
+    "Projects": ("project", "projects"),
+    "Certifications": ("certification", "certifications"),
+    "Languages": ("languages",),
+    "Research Work": ("research", "publications"),
+    "Achievements": ("achievements", "awards"),
+}
+SECTION_TITLE_KEYS = {title: key for key, titles in SECTION_TITLES.items() for title in titles}
+_SECTION_TITLE_ALTERNATION = "|".join(sorted(
+    (r"[ \t]+".join(map(re.escape, title.split())) for title in SECTION_TITLE_KEYS), key=len, reverse=True
+))
+SECTION_HEADER_PATTERN = re.compile(
+    r"^[ \t]*(?:"
+    rf"#{{1,6}}[ \t]+(?:\*\*|__)?(?P<heading>{_SECTION_TITLE_ALTERNATION})[ \t]*:?[ \t]*(?:\*\*|__)?"
+    rf"|(?P<mark>\*\*|__)[ \t]*(?P<bold>{_SECTION_TITLE_ALTERNATION})[ \t]*:?[ \t]*(?P=mark)"
+    rf"|(?P<caps>{_SECTION_TITLE_ALTERNATION})"
+    r")[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def split_resume_sections(resume_text: str) -> List[Tuple[Tuple[str, ...], str]]:
+    """
+    Splits resume text at standalone section headings into (schema keys, snippet)
+    pairs. The text before the first heading is the contact block. Returns an empty
+    list when the split is not clean (no contact block, fewer than two headings, or
+    a section heading that repeats), in which case the caller extracts from the full
+    text instead.
+    """
+    headers = [
+        match for match in SECTION_HEADER_PATTERN.finditer(resume_text)
+        # A bare title only counts in all caps; "Skills" alone may be body text
+        if match.group("caps") is None or match.group("caps").isupper()
+    ]
+    if len(headers) < 2 or not resume_text[:headers[0].start()].strip():
+        return []
+
+    snippets: Dict[str, str] = {}
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        title = header.group("heading") or header.group("bold") or header.group("caps")
+        key = SECTION_TITLE_KEYS[" ".join(title.lower().split())]
+        if key in snippets:
+            # A repeated section means a heading matched inside another section
+            # (or the layout is unusual); don't guess which text belongs where
+            return []
+        end = next_header.start() if next_header else len(resume_text)
+        snippets[key] = resume_text[header.start():end]
+
+    # An unlabeled summary usually sits right under the contact details
+    preamble_keys = ("Personal Data",) if "Profile Summary" in snippets else ("Personal Data", "Profile Summary")
+    sections = [(preamble_keys, resume_text[:headers[0].start()])]
+    sections.extend(((key,), snippet) for key, snippet in snippets.items())
+    return sections
+
+
+@lru_cache(maxsize=1)
+def _validate_docx_dependencies() -> None:
+    """
+    Warns once per process if the DOCX converter's extras are missing; the import
+    and converter construction are not worth repeating per ResumeService.
+    """
+    missing_deps = []
+    try:
+        from markitdown.converters import DocxConverter
+        DocxConverter()
+    except ImportError:
+        missing_deps.append("markitdown[all]==0.1.2")
+    except Exception as e:
+        if "MissingDependencyException" in str(e) or "dependencies needed to read .docx files" in str(e):
+            missing_deps.append("markitdown[all]==0.1.2 (current installation missing DOCX extras)")
+
+    if missing_deps:
+        logger.warning(
+            f"Missing dependencies for DOCX processing: {', '.join(missing_deps)}. "
+            f"DOCX file processing may fail. Install with: pip install {' '.join(missing_deps)}"
+        )
+
 
 class ResumeService:
     # Removed db: AsyncSession dependency
@@ -27,38 +125,25 @@ class ResumeService:
         # Removed self.db assignment
         self.md = MarkItDown(enable_plugins=False)
         self.json_agent_manager = AgentManager() # Keep AgentManager
+        # resume text digest -> validated structured resume, so re-uploading the
+        # same file skips the LLM extraction
+        self.extraction_cache = ResponseCache(maxsize=512)
+        # schema keys -> (prompt head with the schema filled in, prompt tail)
+        self._prompt_parts: Dict[Optional[Tuple[str, ...]], Tuple[str, str]] = {}
 
         # Validate dependencies for DOCX processing (optional, can be kept)
-        self._validate_docx_dependencies()
-
-    def _validate_docx_dependencies(self):
-        # --- This method remains the same ---
-        missing_deps = []
-        try:
-            from markitdown.converters import DocxConverter
-            DocxConverter()
-        except ImportError:
-            missing_deps.append("markitdown[all]==0.1.2")
-        except Exception as e:
-            if "MissingDependencyException" in str(e) or "dependencies needed to read .docx files" in str(e):
-                missing_deps.append("markitdown[all]==0.1.2 (current installation missing DOCX extras)")
-
-        if missing_deps:
-            logger.warning(
-                f"Missing dependencies for DOCX processing: {', '.join(missing_deps)}. "
-                f"DOCX file processing may fail. Install with: pip install {' '.join(missing_deps)}"
-            )
+        _validate_docx_dependencies()
 
     # Renamed method, removed db storage, changed return type
     async def parse_resume(
-        self, file_bytes: bytes, file_type: str, filename: str
+        self, file_stream: BinaryIO, file_type: str, filename: str
     ) -> Tuple[str, Dict | None]:
         """
         Converts resume file (PDF/DOCX) to text using MarkItDown and
         extracts structured JSON data using an LLM. Does NOT store in DB.
 
         Args:
-            file_bytes: Raw bytes of the uploaded file
+            file_stream: Readable binary file object positioned at the start of the upload
             file_type: MIME type of the file
             filename: Original filename
 
@@ -73,19 +158,23 @@ class ResumeService:
         """
         text_content = ""
         structured_resume_data = None
-        temp_path = None
-
-        with tempfile.NamedTemporaryFile(
+        temp_file = tempfile.NamedTemporaryFile(
             delete=False, suffix=self._get_file_extension(file_type)
-        ) as temp_file:
-            temp_file.write(file_bytes)
-            temp_path = temp_file.name
+        )
+        temp_path = temp_file.name
 
         try:
+            # Copy in fixed-size chunks off the event loop rather than materializing
+            # the whole upload as one bytes object first. Inside the try, so a failed
+            # or cancelled copy still removes the file.
+            with temp_file:
+                await run_in_threadpool(shutil.copyfileobj, file_stream, temp_file)
+
             # --- File Conversion ---
             try:
                 logger.info(f"Converting file: {filename} ({file_type})")
-                result = self.md.convert(temp_path)
+                # PDF/DOCX conversion is blocking; run it in the threadpool
+                result = await run_in_threadpool(self.md.convert, temp_path)
                 text_content = result.text_content
                 if not text_content or not text_content.strip():
                      logger.warning(f"Conversion resulted in empty text content for file: {filename}")
@@ -106,7 +195,8 @@ class ResumeService:
 
             # --- Structured Data Extraction ---
             logger.info(f"Attempting structured data extraction for file: {filename}")
-            logger.info(f"text_content: " + text_content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("text_content: %s", text_content)
             structured_resume_data = await self._extract_structured_json(text_content)
             # _extract_structured_json raises ResumeValidationError on failure
 
@@ -148,14 +238,87 @@ class ResumeService:
         if not resume_text or not resume_text.strip():
             logger.warning("Cannot extract structured JSON from empty resume text.")
             raise ResumeValidationError(message="Cannot parse structure from empty resume content.")
-    
-        prompt_template = prompt_factory.get("structured_resume")
-        prompt = prompt_template.format(
-            json.dumps(json_schema_factory.get("structured_resume"), indent=2),
-            resume_text,
-        )
+
+        key = hashlib.blake2b(resume_text.encode(), digest_size=16).hexdigest()
+        cached = self.extraction_cache.get(key)
+        if cached is not None:
+            logger.debug("Returning cached structured resume extraction.")
+            return cached
+        structured, trusted = await self._extract_uncached(resume_text)
+        if trusted:
+            self.extraction_cache.set(key, structured)
+        return structured
+
+    async def _extract_uncached(self, resume_text: str) -> Tuple[Dict, bool]:
+        """
+        Returns the validated structured resume and whether it may be cached: full-text
+        results always, sectional results only when every section filled its keys.
+        """
+        # Extract each section with its own small prompt, concurrently. Output tokens
+        # dominate latency, so several short calls finish well before one long one.
+        # Past the cap, one full-text call is cheaper than a call per section
+        sections = split_resume_sections(resume_text)
+        if sections and len(sections) <= settings.RESUME_EXTRACTION_MAX_SECTIONS:
+            logger.debug(f"Extracting structured resume from {len(sections)} sections.")
+            try:
+                merged = await self._extract_sections(sections)
+                structured = self._validate_structured_resume(merged)
+            except ResumeValidationError as e:
+                logger.warning(f"Sectional extraction failed ({e}); retrying with the full resume text.")
+            else:
+                # An empty key for a section that had its own heading suggests the
+                # snippet lost data; serve the result but don't pin it in the cache
+                complete = all(merged.get(key) for keys, _ in sections[1:] for key in keys)
+                return structured, complete
+
         logger.debug("Sending prompt for structured resume extraction.")
-    
+        parsed = await self._run_extraction(self._build_extraction_prompt(resume_text))
+        return self._validate_structured_resume(parsed), True
+
+    def _build_extraction_prompt(self, resume_text: str, keys: Optional[Tuple[str, ...]] = None) -> str:
+        """
+        Builds the extraction prompt for the whole schema, or only for `keys`.
+        The schema part is fixed per key set, so it is formatted once and each
+        prompt is plain concatenation around the resume text.
+        """
+        parts = self._prompt_parts.get(keys)
+        if parts is None:
+            if keys is None:
+                schema = json_schema_factory.get_serialized("structured_resume")
+            else:
+                schema = json_schema_factory.get_serialized_subset("structured_resume", keys)
+            head, tail = prompt_factory.get("structured_resume").split("{1}")
+            parts = self._prompt_parts[keys] = (head.format(schema), tail)
+        return parts[0] + resume_text + parts[1]
+
+    async def _extract_sections(self, sections: List[Tuple[Tuple[str, ...], str]]) -> Dict[str, Any]:
+        """
+        Runs one extraction per section and merges the partial results. Every
+        section also reports its keywords; those are combined without duplicates.
+        """
+        partials = await asyncio.gather(*(
+            self._run_extraction(self._build_extraction_prompt(snippet, keys + ("Extracted Keywords",)))
+            for keys, snippet in sections
+        ))
+
+        merged: Dict[str, Any] = {}
+        keywords: List[str] = []
+        for (keys, _), partial in zip(sections, partials):
+            if not isinstance(partial, dict):
+                raise ResumeValidationError(message="Unexpected output format from AI agent.")
+            for key in keys:
+                if key in partial:
+                    merged[key] = partial[key]
+            section_keywords = partial.get("Extracted Keywords")
+            if isinstance(section_keywords, list):
+                keywords.extend(section_keywords)
+        merged["Extracted Keywords"] = list(dict.fromkeys(keywords))
+        return merged
+
+    async def _run_extraction(self, prompt: str) -> Any:
+        """
+        Sends one extraction prompt and returns the parsed (possibly repaired) JSON.
+        """
         generation_config = {
             "max_tokens": 8192,
             "max_output_tokens": 8192,
@@ -163,38 +326,32 @@ class ResumeService:
         }
     
         try:
-            raw_output = await self.json_agent_manager.run(
-                prompt=prompt,
-                **generation_config
-            )
-            logger.info(f"raw_output: {raw_output}")
+            async with _EXTRACTION_SEM:
+                raw_output = await self.json_agent_manager.run(
+                    prompt=prompt,
+                    **generation_config
+                )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("raw_output: %s", raw_output)
         except Exception as agent_error:
             logger.error(f"AgentManager failed during structured JSON extraction: {agent_error}", exc_info=True)
             raise ResumeValidationError(message=f"AI agent failed to process the resume content: {agent_error}")
     
-        # --- Step 1: Detect Gemini truncation or incomplete JSON ---
-        if isinstance(raw_output, dict) and raw_output.get("_finish_reason") == "MAX_TOKENS":
-            logger.warning("Gemini output truncated at MAX_TOKENS; attempting continuation.")
-            continuation_prompt = "Continue from where you left off. Finish the remaining JSON exactly."
-            try:
-                continuation_output = await self.json_agent_manager.run(
-                    prompt=continuation_prompt,
-                    **generation_config
-                )
-                raw_output = (raw_output.get("text") or "") + (continuation_output or "")
-            except Exception as continuation_error:
-                logger.error(f"Continuation failed: {continuation_error}", exc_info=True)
-    
-        # --- Step 2: Attempt to parse or repair JSON ---
+        # No continuation round-trip on truncation: no provider reports a finish
+        # reason, and the sectional prompts stay far below the output ceiling anyway.
+        # --- Parse, repairing only if the strict parse fails ---
         parsed = None
         if isinstance(raw_output, str):
             try:
-                parsed = json.loads(raw_output)
-            except json.JSONDecodeError:
+                parsed = orjson.loads(raw_output)
+            except orjson.JSONDecodeError:
                 logger.warning("Malformed JSON detected; attempting json_repair.")
                 try:
-                    repaired = repair_json(raw_output)
-                    parsed = json.loads(repaired)
+                    # Already known not to be valid JSON, so skip json_repair's own
+                    # json.loads attempt; it is pure Python, so keep it off the loop
+                    parsed = await run_in_threadpool(
+                        repair_json, raw_output, return_objects=True, skip_json_loads=True
+                    )
                 except Exception as repair_error:
                     logger.error(f"JSON repair failed: {repair_error}", exc_info=True)
                     raise ResumeValidationError(message="Resume extraction failed due to truncated JSON output.")
@@ -203,7 +360,9 @@ class ResumeService:
             parsed = raw_output
         else:
             raise ResumeValidationError(message="Unexpected output format from AI agent.")
-    
+        return parsed
+
+    def _validate_structured_resume(self, parsed: Any) -> Dict:
         # --- Step 3: Validate with Pydantic ---
         try:
             structured_resume_model = StructuredResumeModel.model_validate(parsed)
@@ -5,6 +5,7 @@ import logging
 import markdown
 import numpy as np
 
+from functools import lru_cache
 from sqlalchemy.future import select
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,6 +28,16 @@ from .exceptions import (
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _shared_managers() -> Tuple[AgentManager, AgentManager, EmbeddingManager]:
+    """
+    Builds the agent/embedding managers once per worker. They hold no per-request
+    state, so every ScoreImprovementService can share them and only bind its own
+    AsyncSession.
+    """
+    return AgentManager(strategy="md"), AgentManager(), EmbeddingManager()
+
+
 class ScoreImprovementService:
     """
     Service to handle scoring of resumes and jobs using embeddings.
@@ -38,9 +49,11 @@ class ScoreImprovementService:
     def __init__(self, db: AsyncSession, max_retries: int = 5):
         self.db = db
         self.max_retries = max_retries
-        self.md_agent_manager = AgentManager(strategy="md")
-        self.json_agent_manager = AgentManager()
-        self.embedding_manager = EmbeddingManager()
+        (
+            self.md_agent_manager,
+            self.json_agent_manager,
+            self.embedding_manager,
+        ) = _shared_managers()
 
     def _validate_resume_keywords(
         self, processed_resume: ProcessedResume, resume_id: str
@@ -182,10 +195,12 @@ class ScoreImprovementService:
         """
         prompt_template = prompt_factory.get("structured_resume")
         prompt = prompt_template.format(
-            json.dumps(json_schema_factory.get("resume_preview"), indent=2),
+            json_schema_factory.get_serialized("resume_preview"),
             updated_resume,
         )
-        logger.info(f"Structured Resume Prompt: {prompt}")
+        # The prompt embeds the whole resume; keep it out of INFO logs
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Structured Resume Prompt: %s", prompt)
         raw_output = await self.json_agent_manager.run(prompt=prompt)
 
         try:
@@ -215,14 +230,8 @@ class ScoreImprovementService:
             )
         )
 
-        resume_embedding_task = asyncio.create_task(
-            self.embedding_manager.embed(resume.content)
-        )
-        job_kw_embedding_task = asyncio.create_task(
-            self.embedding_manager.embed(extracted_job_keywords)
-        )
-        resume_embedding, extracted_job_keywords_embedding = await asyncio.gather(
-            resume_embedding_task, job_kw_embedding_task
+        resume_embedding, extracted_job_keywords_embedding = await self.embedding_manager.embed_batch(
+            [resume.content, extracted_job_keywords]
         )
 
         cosine_similarity_score = self.calculate_cosine_similarity(
@@ -241,7 +250,8 @@ class ScoreImprovementService:
             updated_resume=updated_resume
         )
 
-        logger.info(f"Resume Preview: {resume_preview}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Resume Preview: %s", resume_preview)
 
         execution = {
             "resume_id": resume_id,
@@ -280,9 +290,8 @@ class ScoreImprovementService:
             )
         )
 
-        resume_embedding = await self.embedding_manager.embed(text=resume.content)
-        extracted_job_keywords_embedding = await self.embedding_manager.embed(
-            text=extracted_job_keywords
+        resume_embedding, extracted_job_keywords_embedding = await self.embedding_manager.embed_batch(
+            [resume.content, extracted_job_keywords]
         )
 
         yield f"data: {json.dumps({'status': 'scoring', 'message': 'Calculating compatibility score...'})}\n\n"
@@ -0,0 +1,81 @@
+from app.services.resume_service import split_resume_sections
+
+
+CONTACT = "Jane Doe\njane@example.com | +1 555 0100\n\n"
+
+
+def _sections(text):
+    return {keys: snippet for keys, snippet in split_resume_sections(text)}
+
+
+def test_inline_project_and_skills_lines_stay_in_their_section():
+    text = CONTACT + (
+        "## Experience\n"
+        "**Engineer**, Acme\n"
+        "Project: Checkout revamp\n"
+        "- Cut checkout latency by 40%\n"
+        "Skills: Python, Kafka\n"
+        "**Intern**, Foo\n"
+        "- Built internal dashboards\n"
+        "\n"
+        "## Education\n"
+        "BSc Computer Science, State University\n"
+    )
+    sections = _sections(text)
+
+    assert set(sections) == {("Personal Data", "Profile Summary"), ("Experiences",), ("Education",)}
+    experience = sections[("Experiences",)]
+    assert "Project: Checkout revamp" in experience
+    assert "Skills: Python, Kafka" in experience
+    assert "**Intern**, Foo" in experience
+
+
+def test_heading_styles():
+    text = CONTACT + (
+        "# Work Experience\n"
+        "Engineer, Acme\n"
+        "**Skills:**\n"
+        "Python\n"
+        "EDUCATION\n"
+        "BSc, State University\n"
+        "__Projects__\n"
+        "Checkout revamp\n"
+    )
+    sections = _sections(text)
+
+    assert list(sections)[1:] == [("Experiences",), ("Skills",), ("Education",), ("Projects",)]
+    assert sections[("Skills",)] == "**Skills:**\nPython\n"
+
+
+def test_bare_title_case_line_is_not_a_heading():
+    text = CONTACT + (
+        "## Experience\n"
+        "Engineer, Acme\n"
+        "Skills\n"
+        "- Python\n"
+        "## Education\n"
+        "BSc, State University\n"
+    )
+    sections = _sections(text)
+
+    assert ("Skills",) not in sections
+    assert "Skills\n- Python" in sections[("Experiences",)]
+
+
+def test_repeated_section_falls_back_to_full_text():
+    text = CONTACT + (
+        "## Experience\n"
+        "Engineer, Acme\n"
+        "## Projects\n"
+        "Checkout revamp\n"
+        "## Experience\n"
+        "Intern, Foo\n"
+    )
+    assert split_resume_sections(text) == []
+
+
+def test_unsplittable_text_falls_back_to_full_text():
+    # No contact block before the first heading
+    assert split_resume_sections("## Experience\nEngineer\n## Education\nBSc\n") == []
+    # A single heading
+    assert split_resume_sections(CONTACT + "## Experience\nEngineer, Acme\n") == []